@@ -0,0 +1,326 @@
+"""Benchmark circuit construction with the commands and operators APIs.
+
+For every scenario and API this measures build throughput (top level
+commands generated and lowered per second, best of several repeats), peak
+traced memory of a build and the number of memory blocks allocated per
+command by generating the command list. Results are printed as a table and
+can be written as JSON to track regressions.
+
+Run with ``python benchmarks/bench_builders.py [--size N] [--output FILE]``.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pytket
+from pytket import Bit, Circuit, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+
+from pytket_circuit_builder_api import __version__, extensions
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands import commands as cmd
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.commands.layers import brickwork_pairs
+from pytket_circuit_builder_api.operators import operators as ops
+
+extensions.install()
+
+WIDTH = 16
+
+Generate = Callable[[int], list[Any]]
+Lower = Callable[[list[Any]], Circuit]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A construction workload, generated by either API from a gate budget."""
+
+    name: str
+    commands: Generate
+    operators: Generate | None
+    lower_commands: Lower = Circuit.from_operation_list
+
+
+@dataclass(frozen=True)
+class Result:
+    """Measurements of one scenario built with one API."""
+
+    scenario: str
+    api: str
+    n_gates: int
+    seconds: float
+    gates_per_second: float
+    peak_bytes: int
+    blocks_per_gate: float
+
+
+def _qubits() -> list[Qubit]:
+    return list(QubitRegister("q", WIDTH))
+
+
+def flat_commands(size: int) -> list[Any]:
+    q = _qubits()
+    commands = []
+    for i in range(size // 2):
+        commands.append(cmd.CX(q[i % WIDTH], q[(i + 1) % WIDTH]))
+        commands.append(cmd.Rz(Angle(0.1), q[i % WIDTH]))
+    return commands
+
+
+def flat_operators(size: int) -> list[Any]:
+    q = _qubits()
+    commands = []
+    for i in range(size // 2):
+        commands.append(ops.CX()(q[i % WIDTH], q[(i + 1) % WIDTH]))
+        commands.append(ops.Rz(Angle(0.1))(q[i % WIDTH]))
+    return commands
+
+
+def brickwork_commands(size: int) -> list[Any]:
+    q = _qubits()
+    depth = max(1, size // (WIDTH // 2))
+    return [cmd.CX(q[a], q[b]) for a, b in brickwork_pairs(WIDTH, depth)]
+
+
+def brickwork_operators(size: int) -> list[Any]:
+    q = _qubits()
+    depth = max(1, size // (WIDTH // 2))
+    return [ops.CX()(q[a], q[b]) for a, b in brickwork_pairs(WIDTH, depth)]
+
+
+def qcontrolled_commands(size: int) -> list[Any]:
+    q = _qubits()
+    commands = []
+    for i in range(size):
+        target = q[i % WIDTH]
+        controls = [q[(i + k) % WIDTH] for k in range(1, 4)]
+        commands.append(cmd.QControlled(cmd.Rz(Angle(0.1 * (i % 8)), target), controls))
+    return commands
+
+
+def qcontrolled_operators(size: int) -> list[Any]:
+    q = _qubits()
+    commands = []
+    for i in range(size):
+        operands = [q[(i + k) % WIDTH] for k in range(1, 4)] + [q[i % WIDTH]]
+        operator = ops.QControlled(ops.Rz(Angle(0.1 * (i % 8))), n_control_qubits=3)
+        commands.append(operator(operands))
+    return commands
+
+
+@cmd.pytket_circbox
+def _inner_commands(q0: Qubit, q1: Qubit) -> cmd.CircBox:
+    yield cmd.CX(q0, q1)
+    yield cmd.Rz(Angle(0.2), q1)
+    yield cmd.CX(q0, q1)
+
+
+@cmd.pytket_circbox
+def _outer_commands(q0: Qubit, q1: Qubit, q2: Qubit) -> cmd.CircBox:
+    yield _inner_commands(q0, q1)
+    yield _inner_commands(q1, q2)
+
+
+def nested_circbox_commands(size: int) -> list[Any]:
+    q = _qubits()
+    return [
+        _outer_commands(q[i % WIDTH], q[(i + 1) % WIDTH], q[(i + 2) % WIDTH])
+        for i in range(size // 6)
+    ]
+
+
+def nested_circbox_operators(size: int) -> list[Any]:
+    q = _qubits()
+    a, b, c = Qubit("qX", 0), Qubit("qX", 1), Qubit("qX", 2)
+    inner = ops.CircBox(
+        Circuit.from_operation_list2(
+            [ops.CX()(a, b), ops.Rz(Angle(0.2))(b), ops.CX()(a, b)],
+        ),
+    )
+    outer = ops.CircBox(
+        Circuit.from_operation_list2([inner([a, b]), inner([b, c])]),
+    )
+    return [
+        outer([q[i % WIDTH], q[(i + 1) % WIDTH], q[(i + 2) % WIDTH]])
+        for i in range(size // 6)
+    ]
+
+
+def conditional_commands(size: int) -> list[Any]:
+    q = _qubits()
+    c: list[Bit] = list(BitRegister("c", 2))
+    commands = [
+        Conditional(
+            cmd.Rz(Angle(0.3), q[i % WIDTH]),
+            QasmCondition(c, i % 4),
+        )
+        for i in range(size)
+    ]
+    return commands
+
+
+def _angle(symbolic: bool, i: int) -> Angle:
+    return Angle(f"a{i % 64}") if symbolic else Angle(0.01 * (i % 64))
+
+
+def _rotations_commands(symbolic: bool) -> Generate:
+    def build(size: int) -> list[Any]:
+        q = _qubits()
+        return [
+            cmd.CRz(_angle(symbolic, i), q[i % WIDTH], q[(i + 1) % WIDTH])
+            for i in range(size)
+        ]
+
+    return build
+
+
+def _rotations_operators(symbolic: bool) -> Generate:
+    def build(size: int) -> list[Any]:
+        q = _qubits()
+        return [
+            ops.CRz(_angle(symbolic, i))(q[i % WIDTH], q[(i + 1) % WIDTH])
+            for i in range(size)
+        ]
+
+    return build
+
+
+def _from_conditionals(commands: list[Any]) -> Circuit:
+    # from_operation_list only adds qubits, conditionals also need their bits
+    return Circuit.from_operation_stream(commands)
+
+
+SCENARIOS = [
+    Scenario("flat_cx_rz", flat_commands, flat_operators),
+    Scenario("brickwork", brickwork_commands, brickwork_operators),
+    Scenario("qcontrolled", qcontrolled_commands, qcontrolled_operators),
+    Scenario("nested_circbox", nested_circbox_commands, nested_circbox_operators),
+    # the operators API has no conditional commands
+    Scenario("conditional", conditional_commands, None, _from_conditionals),
+    Scenario(
+        "numeric_angles",
+        _rotations_commands(symbolic=False),
+        _rotations_operators(symbolic=False),
+    ),
+    Scenario(
+        "symbolic_angles",
+        _rotations_commands(symbolic=True),
+        _rotations_operators(symbolic=True),
+    ),
+]
+
+
+def measure(
+    scenario: str,
+    api: str,
+    generate: Generate,
+    lower: Lower,
+    size: int,
+    repeat: int,
+) -> Result:
+    """Generate and lower a workload repeatedly and collect its measurements."""
+    n_gates = len(generate(size))
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        lower(generate(size))
+        seconds = min(seconds, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    lower(generate(size))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # blocks held by the generated commands, before lowering
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    commands = generate(size)
+    blocks = sys.getallocatedblocks() - blocks_before
+    del commands
+
+    return Result(
+        scenario=scenario,
+        api=api,
+        n_gates=n_gates,
+        seconds=seconds,
+        gates_per_second=n_gates / seconds,
+        peak_bytes=peak_bytes,
+        blocks_per_gate=blocks / n_gates,
+    )
+
+
+def run(size: int, repeat: int, names: list[str] | None = None) -> list[Result]:
+    """Measure every selected scenario with both APIs."""
+    results = []
+    for scenario in SCENARIOS:
+        if names and scenario.name not in names:
+            continue
+        results.append(
+            measure(
+                scenario.name,
+                "commands",
+                scenario.commands,
+                scenario.lower_commands,
+                size,
+                repeat,
+            ),
+        )
+        if scenario.operators is not None:
+            results.append(
+                measure(
+                    scenario.name,
+                    "operators",
+                    scenario.operators,
+                    Circuit.from_operation_list2,
+                    size,
+                    repeat,
+                ),
+            )
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20_000, help="gates per build")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", action="append", help="run only these")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.size, args.repeat, args.scenario)
+    print(
+        f"{'scenario':<18}{'api':<11}{'gates':>8}{'gates/s':>12}"
+        f"{'peak MiB':>10}{'blocks/gate':>13}",
+    )
+    for result in results:
+        print(
+            f"{result.scenario:<18}{result.api:<11}{result.n_gates:>8}"
+            f"{result.gates_per_second:>12.0f}{result.peak_bytes / 2**20:>10.1f}"
+            f"{result.blocks_per_gate:>13.1f}",
+        )
+    if args.output:
+        report = {
+            "version": __version__,
+            "pytket_version": pytket.__version__,
+            "python_version": platform.python_version(),
+            "size": args.size,
+            "results": [asdict(result) for result in results],
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the time to import the package in a fresh interpreter.
+
+Each module is imported in new processes, with and without the automatic
+installation of the Circuit extensions, and the median wall time of the
+import is reported together with whether sympy got loaded.
+
+Run with ``python benchmarks/bench_import.py [--repeat N] [--output FILE]``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "pytket",
+    "pytket_circuit_builder_api.angle",
+    "pytket_circuit_builder_api.commands.commands",
+    "pytket_circuit_builder_api.commands.conditional",
+    "pytket_circuit_builder_api.operators.operators",
+    "pytket_circuit_builder_api.commands.buffer",
+]
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "sympy" in sys.modules)
+"""
+
+
+def time_import(module: str, auto_install: bool) -> tuple[float, bool]:
+    """Import module in a new interpreter, returning the time and if sympy loaded."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "PYTKET_CIRCUIT_BUILDER_AUTO_INSTALL": "1" if auto_install else "0",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(module=module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def main() -> None:
+    """Time every module and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'module':<50}{'auto install':>14}{'ms':>9}{'sympy':>7}")
+    for module in MODULES:
+        for auto_install in (True, False):
+            runs = [time_import(module, auto_install) for _ in range(args.repeat)]
+            seconds = statistics.median(run[0] for run in runs)
+            sympy_loaded = any(run[1] for run in runs)
+            results.append(
+                {
+                    "module": module,
+                    "auto_install": auto_install,
+                    "seconds": seconds,
+                    "sympy_loaded": sympy_loaded,
+                },
+            )
+            print(
+                f"{module:<50}{auto_install!s:>14}{seconds * 1e3:>9.1f}"
+                f"{sympy_loaded!s:>7}",
+            )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"repeat": args.repeat, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
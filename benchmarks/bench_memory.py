@@ -0,0 +1,76 @@
+"""Benchmark the memory held per command, before lowering.
+
+Builds lists of commands of each kind with both APIs and reports the bytes
+traced by tracemalloc per command, excluding the list itself and shared
+objects such as qubits, angles and operators.
+
+Run with ``python benchmarks/bench_memory.py [--n N] [--output FILE]``.
+"""
+
+import argparse
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from pytket._tket.unit_id import BitRegister, QubitRegister
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands import commands as cmd
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.operators import operators as ops
+
+Q = list(QubitRegister("q", 4))
+C = list(BitRegister("c", 1))
+ANGLE = Angle(0.25)
+CX_OPERATOR = ops.CX()
+RZ_OPERATOR = ops.Rz(ANGLE)
+QCONTROLLED_OPERATOR = ops.QControlled(RZ_OPERATOR, n_control_qubits=2)
+CONDITION = QasmCondition(C, 1)
+
+COMMANDS: dict[str, Callable[[], Any]] = {
+    "commands.CX": lambda: cmd.CX(Q[0], Q[1]),
+    "commands.Rz": lambda: cmd.Rz(ANGLE, Q[0]),
+    "commands.CRz": lambda: cmd.CRz(ANGLE, Q[0], Q[1]),
+    "commands.QControlled": lambda: cmd.QControlled(
+        cmd.Rz(ANGLE, Q[0]),
+        (Q[1], Q[2]),
+    ),
+    "commands.Conditional": lambda: Conditional(cmd.Rz(ANGLE, Q[0]), CONDITION),
+    "operators.CX": lambda: CX_OPERATOR(Q[0], Q[1]),
+    "operators.Rz": lambda: RZ_OPERATOR(Q[0]),
+    "operators.QControlled": lambda: QCONTROLLED_OPERATOR([Q[1], Q[2], Q[0]]),
+}
+
+
+def bytes_per_command(make: Callable[[], Any], n: int) -> float:
+    """Return the memory held by each of n commands built by make."""
+    commands = [None] * n
+    make()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        commands[i] = make()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held / n
+
+
+def main() -> None:
+    """Measure every command kind and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000, help="commands per kind")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {name: bytes_per_command(make, args.n) for name, make in COMMANDS.items()}
+    print(f"{'command':<24}{'bytes/command':>14}")
+    for name, size in results.items():
+        print(f"{name:<24}{size:>14.1f}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"n": args.n, "bytes_per_command": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
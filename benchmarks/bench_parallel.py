@@ -0,0 +1,53 @@
+"""Benchmark parallel block construction against the number of worker processes.
+
+Run with ``python benchmarks/bench_parallel.py``.
+"""
+
+import os
+import time
+from collections.abc import Iterator
+
+from pytket import Qubit
+from pytket._tket.unit_id import QubitRegister
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, CRz, Rz
+from pytket_circuit_builder_api.commands.parallel import Block, build_parallel
+
+N_BLOCKS = 16
+BLOCK_WIDTH = 8
+BLOCK_LAYERS = 200
+
+
+def qft_like_block(*qubits: Qubit) -> Iterator[CX | CRz | Rz]:
+    """Generate a block of rotations and entangling layers on qubits."""
+    for layer in range(BLOCK_LAYERS):
+        for i, qubit in enumerate(qubits):
+            yield Rz(Angle(0.01 * (layer + i)), qubit)
+        for i in range(layer % 2, len(qubits) - 1, 2):
+            yield CX(qubits[i], qubits[i + 1])
+            yield CRz(Angle(0.5), qubits[i + 1], qubits[i])
+
+
+def main() -> None:
+    """Time build_parallel for increasing numbers of processes."""
+    blocks = [
+        Block(qft_like_block, tuple(QubitRegister(f"r{b}", BLOCK_WIDTH)))
+        for b in range(N_BLOCKS)
+    ]
+    start = time.perf_counter()
+    circuit = build_parallel(blocks)
+    serial = time.perf_counter() - start
+    print(f"gates: {circuit.n_gates}")
+    print(f"serial: {serial:.3f}s")
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        build_parallel(blocks, processes=processes)
+        elapsed = time.perf_counter() - start
+        print(f"processes={processes}: {elapsed:.3f}s speedup {serial / elapsed:.2f}x")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
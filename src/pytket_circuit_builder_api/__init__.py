@@ -0,0 +1,10 @@
+def __getattr__(name: str) -> str:
+    # read on first use, importing importlib.metadata slows down the import
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version("pytket-circuit-builder-api")
+        except PackageNotFoundError:  # used from a source tree
+            return "0+unknown"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,83 @@
-import sympy
+import functools
+from numbers import Real
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sympy
+
+# sympy is slow to import, so it is only imported once a symbolic angle (or the
+# expression of a concrete one) is needed
+
+
+@functools.lru_cache(maxsize=4096)
+def _sympify_str(ang: str) -> "sympy.Expr":
+    import sympy
+
+    return sympy.sympify(ang)
 
 
 class Angle:
-    """Class for representing concrete or symbolic angles."""
+    """Class for representing concrete or symbolic angles.
 
-    expr: sympy.Expr
+    Concrete angles are stored as floats and only converted to a sympy
+    expression when ``expr`` is requested. Symbolic strings are parsed once
+    and the resulting expressions are shared between angles.
+    """
 
     def __init__(self, ang: float | str) -> None:
         """Initialize from a float or a string."""
-        self.expr = sympy.sympify(ang)
+        if isinstance(ang, Real):
+            self._value: float | None = float(ang)
+            self._expr: "sympy.Expr | None" = None
+            return
+        if isinstance(ang, str):
+            expr = _sympify_str(ang)
+        else:
+            import sympy
+
+            expr = sympy.sympify(ang)
+        self._expr = expr
+        self._value = None
+        if expr.is_number:
+            try:
+                self._value = float(expr)
+            except TypeError:
+                pass
+
+    @property
+    def expr(self) -> "sympy.Expr":
+        """Return the angle as a sympy expression."""
+        if self._expr is None:
+            import sympy
+
+            self._expr = sympy.Float(self._value)
+        return self._expr
+
+    @property
+    def value(self) -> float | None:
+        """Return the angle as a float, or None if it is symbolic."""
+        return self._value
+
+    def is_symbolic(self) -> bool:
+        """Return whether the angle contains free symbols."""
+        return self._value is None
+
+    @property
+    def param(self) -> "float | sympy.Expr":
+        """Return the angle in the form passed to tket, a float when concrete."""
+        if self._value is not None:
+            return self._value
+        return self._expr
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
+        return self.param == other.param
+
+    def __hash__(self) -> int:
+        return hash(self.param)
+
+    def __repr__(self) -> str:
+        if self._value is not None:
+            return f"Angle({self._value!r})"
+        return f"Angle({str(self._expr)!r})"
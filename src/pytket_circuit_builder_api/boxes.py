@@ -0,0 +1,83 @@
+import hashlib
+import json
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+from pytket import Circuit
+from pytket._tket.circuit import CircBox as TketCircBox
+from pytket._tket.circuit import Op, QControlBox
+
+from pytket_circuit_builder_api.cache import LRUCache
+
+_n_tket_circboxes = 0
+_DIGEST_ATTR = "_builder_digest"
+
+qcontrolbox_registry: LRUCache[QControlBox] = LRUCache(maxsize=4096)
+
+
+def tket_circbox(circuit: Circuit) -> TketCircBox:
+    """Build a tket CircBox, counting how many distinct boxes have been built."""
+    global _n_tket_circboxes
+    _n_tket_circboxes += 1
+    return TketCircBox(circuit)
+
+
+def n_tket_circboxes() -> int:
+    """Return the number of tket CircBoxes built since the last reset."""
+    return _n_tket_circboxes
+
+
+def reset_tket_circbox_count() -> None:
+    """Reset the counter of built tket CircBoxes."""
+    global _n_tket_circboxes
+    _n_tket_circboxes = 0
+
+
+def _strip_box_ids(data: Any) -> Any:
+    # boxes get a fresh random id on creation, which is not part of their content
+    if isinstance(data, dict):
+        return {
+            key: _strip_box_ids(value)
+            for key, value in data.items()
+            if not (key == "id" and "type" in data)
+        }
+    if isinstance(data, list):
+        return [_strip_box_ids(value) for value in data]
+    return data
+
+
+def circuit_digest(circuit: Circuit) -> str:
+    """Return a content hash of a circuit, ignoring the ids of nested boxes.
+
+    The digest is cached on the circuit, which must not be modified afterwards.
+    """
+    digest = getattr(circuit, _DIGEST_ATTR, None)
+    if digest is None:
+        normalized = json.dumps(_strip_box_ids(circuit.to_dict()), sort_keys=True)
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        setattr(circuit, _DIGEST_ATTR, digest)
+    return digest
+
+
+def op_key(op: Op) -> Hashable | None:
+    """Return a key identifying a plain tket gate by value, or None for boxes."""
+    if type(op) is Op:
+        return (op.type, tuple(op.params))
+    return None
+
+
+def qcontrol_box(
+    op: Op,
+    n_controls: int,
+    control_state: Sequence[bool],
+) -> QControlBox:
+    """Return the shared QControlBox for an op, control count and control state."""
+    control_state = list(control_state)
+    key = op_key(op)
+    if key is None:
+        # boxes carry structure beyond their params, so they are never shared
+        return QControlBox(op, n_controls=n_controls, control_state=control_state)
+    return qcontrolbox_registry.get_or_create(
+        (key, n_controls, tuple(control_state)),
+        lambda: QControlBox(op, n_controls=n_controls, control_state=control_state),
+    )
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+Value = TypeVar("Value")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of the statistics of a cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int | None
+
+
+class LRUCache(Generic[Value]):
+    """Mapping which evicts the least recently used entry when full.
+
+    The bound is a number of entries, not of bytes, and a ``maxsize`` of
+    ``None`` means the cache is unbounded. The cache is thread-safe: entries
+    are created under a re-entrant lock, so concurrent misses on one key
+    create a single entry, and factories may use the cache recursively.
+    """
+
+    def __init__(self, maxsize: int | None = 1024) -> None:
+        """Initialize an empty cache holding at most ``maxsize`` entries."""
+        if maxsize is not None and maxsize < 0:
+            raise Exception("Cache size must be non-negative")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Value] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Value]) -> Value:
+        """Return the entry for key, creating it with factory on a miss."""
+        with self._lock:
+            entries = self._entries
+            try:
+                value = entries[key]
+            except KeyError:
+                self._misses += 1
+                value = factory()
+                if self.maxsize != 0:
+                    entries[key] = value
+                    self._evict()
+                return value
+            self._hits += 1
+            entries.move_to_end(key)
+            return value
+
+    def resize(self, maxsize: int | None) -> None:
+        """Change the size limit, evicting entries if necessary."""
+        if maxsize is not None and maxsize < 0:
+            raise Exception("Cache size must be non-negative")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current statistics of the cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
@@ -0,0 +1,319 @@
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import cast
+
+from pytket import Bit, Circuit, OpType, Qubit
+from pytket._tket.circuit import CircBox as TketCircBox
+from pytket._tket.unit_id import UnitID
+
+from pytket_circuit_builder_api.boxes import circuit_digest
+from pytket_circuit_builder_api.cache import LRUCache
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import CircBox
+from pytket_circuit_builder_api.commands.conditional import Conditional
+
+
+@dataclass(frozen=True)
+class BoxSummary:
+    """Dependency structure of a box definition, per operand (qubits, then bits).
+
+    paths[j][i] is the number of layers on the longest chain of gates from the
+    input of operand i to the output of operand j, and starts[j][i] from the
+    input of operand i to the first gate on operand j, or -1 if there is no
+    such chain. Operands always have a chain of length 0 to their own output.
+    Nested boxes are flattened, so their gates can overlap their neighbours.
+    """
+
+    depth: int
+    n_gates: int
+    paths: tuple[tuple[int, ...], ...]
+    starts: tuple[tuple[int, ...], ...]
+    gate_counts: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class CommandAnalysis:
+    """Depth and ASAP layering of a command list.
+
+    layers[i] is the layer of the first gate of command i when every gate is
+    placed as early as possible. critical_path holds the indices of a longest
+    chain of dependent commands, ending with the command that finishes last.
+    Gates inside boxes are counted individually and a QControlled or
+    Conditional command counts as one gate.
+    """
+
+    depth: int
+    n_gates: int
+    layers: tuple[int, ...]
+    critical_path: tuple[int, ...]
+    gate_counts: dict[Qubit, int]
+
+
+# summaries of box definitions, by circuit digest
+box_summaries: LRUCache[BoxSummary] = LRUCache(maxsize=1024)
+
+
+class _Frontier:
+    # per unit arrays: the layer after its last write and the command which
+    # wrote it, the layer after its last read (by a condition) and the
+    # command which read it, and the number of gates writing it
+
+    def __init__(self) -> None:
+        self.qubit_ids: dict[Qubit, int] = {}
+        self.bit_ids: dict[Bit, int] = {}
+        self.layer = array("q")
+        self.last = array("q")
+        self.read_layer = array("q")
+        self.last_read = array("q")
+        self.counts = array("q")
+
+    def ids(self, units: Sequence[Qubit | Bit], unit_ids: dict) -> list[int]:
+        """Return the ids of units, qubits and bits being keyed separately."""
+        ids = []
+        for unit in units:
+            unit_id = unit_ids.get(unit)
+            if unit_id is None:
+                unit_id = unit_ids[unit] = len(self.layer)
+                self.layer.append(0)
+                self.last.append(-1)
+                self.read_layer.append(0)
+                self.last_read.append(-1)
+                self.counts.append(0)
+            ids.append(unit_id)
+        return ids
+
+    def place_gate(
+        self,
+        index: int,
+        written: Sequence[int],
+        read: Sequence[int] = (),
+    ) -> tuple[int, int, int]:
+        """Place a gate, returning its layer, the next layer and its predecessor.
+
+        A gate writing a unit waits for earlier reads of it, reads only wait
+        for the last write, so gates reading the same bit can run in parallel.
+        """
+        layer, last = self.layer, self.last
+        read_layer, last_read = self.read_layer, self.last_read
+        start = 0
+        predecessor = -1
+        for unit_id in written:
+            if layer[unit_id] > start:
+                start = layer[unit_id]
+                predecessor = last[unit_id]
+            if read_layer[unit_id] > start:
+                start = read_layer[unit_id]
+                predecessor = last_read[unit_id]
+        for unit_id in read:
+            if layer[unit_id] > start:
+                start = layer[unit_id]
+                predecessor = last[unit_id]
+        end = start + 1
+        for unit_id in written:
+            layer[unit_id] = end
+            last[unit_id] = index
+            self.counts[unit_id] += 1
+        for unit_id in read:
+            if end > read_layer[unit_id]:
+                read_layer[unit_id] = end
+                last_read[unit_id] = index
+        return start, end, predecessor
+
+    def place_box(
+        self,
+        index: int,
+        ids: list[int],
+        summary: BoxSummary,
+    ) -> tuple[int, int, int]:
+        """Place the gates of a box, all of its operands counting as written.
+
+        Returns the layer of its first gate, the layer after its last gate
+        and its predecessor.
+        """
+        layer, last = self.layer, self.last
+        read_layer, last_read = self.read_layer, self.last_read
+        inputs = []
+        sources = []
+        for unit_id in ids:
+            if read_layer[unit_id] > layer[unit_id]:
+                inputs.append(read_layer[unit_id])
+                sources.append(last_read[unit_id])
+            else:
+                inputs.append(layer[unit_id])
+                sources.append(last[unit_id])
+        start = end = 0
+        predecessor = -1
+        outputs: list[tuple[int, int, int]] = []
+        for operand, unit_id in enumerate(ids):
+            count = summary.gate_counts[operand]
+            if not count:
+                continue
+            entered, _ = _longest(inputs, summary.starts[operand])
+            exited, source = _longest(inputs, summary.paths[operand])
+            start = entered if not outputs else min(start, entered)
+            if exited > end:
+                end = exited
+                predecessor = sources[source]
+            outputs.append((unit_id, exited, count))
+        for unit_id, exited, count in outputs:
+            layer[unit_id] = exited
+            last[unit_id] = index
+            self.counts[unit_id] += count
+        return start, end, predecessor
+
+
+def _longest(inputs: list[int], lengths: Sequence[int]) -> tuple[int, int]:
+    # longest of the chains from the inputs, and the input it starts from
+    best = source = -1
+    for operand, (value, length) in enumerate(zip(inputs, lengths)):
+        if length >= 0 and value + length > best:
+            best = value + length
+            source = operand
+    return best, source
+
+
+def _compose(
+    vectors: Sequence[tuple[int, ...]],
+    lengths: Sequence[int],
+) -> tuple[int, ...]:
+    # elementwise longest chain through any of the vectors (max-plus product)
+    result = [-1] * len(vectors[0])
+    for vector, length in zip(vectors, lengths):
+        if length < 0:
+            continue
+        for i, value in enumerate(vector):
+            if value >= 0 and value + length > result[i]:
+                result[i] = value + length
+    return tuple(result)
+
+
+def box_summary(circuit: Circuit) -> BoxSummary:
+    """Return the (cached) summary of the simple circuit of a box definition."""
+    return box_summaries.get_or_create(
+        circuit_digest(circuit),
+        lambda: _summarize(circuit),
+    )
+
+
+def _summarize(circuit: Circuit) -> BoxSummary:
+    # per operand, the longest chain from every input to its current output
+    qubit_ids: dict[UnitID, int] = {qubit: i for i, qubit in enumerate(circuit.qubits)}
+    bit_ids: dict[UnitID, int] = {
+        bit: len(qubit_ids) + i for i, bit in enumerate(circuit.bits)
+    }
+    n_operands = len(qubit_ids) + len(bit_ids)
+    paths = [
+        tuple(0 if i == j else -1 for i in range(n_operands)) for j in range(n_operands)
+    ]
+    starts: list[tuple[int, ...] | None] = [None] * n_operands
+    counts = [0] * n_operands
+    n_gates = 0
+    for command in circuit.get_commands():
+        # the arguments include the condition bits of conditional gates
+        ids = [
+            bit_ids[arg] if isinstance(arg, Bit) else qubit_ids[arg]
+            for arg in command.args
+        ]
+        inputs = [paths[unit_id] for unit_id in ids]
+        if command.op.type == OpType.CircBox:
+            summary = box_summary(cast(TketCircBox, command.op).get_circuit())
+            outputs = [
+                (
+                    unit_id,
+                    _compose(inputs, summary.starts[operand]),
+                    _compose(inputs, summary.paths[operand]),
+                    summary.gate_counts[operand],
+                )
+                for operand, unit_id in enumerate(ids)
+                if summary.gate_counts[operand]
+            ]
+            n_gates += summary.n_gates
+        else:
+            entered = _compose(inputs, [0] * len(ids))
+            exited = tuple(value + 1 if value >= 0 else -1 for value in entered)
+            outputs = [(unit_id, entered, exited, 1) for unit_id in ids]
+            n_gates += 1
+        for unit_id, entered, exited, count in outputs:
+            if starts[unit_id] is None:
+                starts[unit_id] = entered
+            paths[unit_id] = exited
+            counts[unit_id] += count
+    unused = (-1,) * n_operands
+    return BoxSummary(
+        depth=max((max(path) for path in paths), default=0),
+        n_gates=n_gates,
+        paths=tuple(paths),
+        starts=tuple(unused if start is None else start for start in starts),
+        gate_counts=tuple(counts),
+    )
+
+
+def analyze(
+    commands: Iterable[TketCompatibleCommand] | CommandBuffer,
+) -> CommandAnalysis:
+    """Compute depth, ASAP layers, critical path and gate counts of commands.
+
+    This works on the operands of the commands alone, without building a
+    circuit, in time linear in the number of operands (nested boxes are
+    summarized once per definition). As in tket, Conditional commands read
+    their condition bits: they wait for the last command writing a bit, but
+    several conditionals on the same bit can share a layer.
+    """
+    if isinstance(commands, CommandBuffer):
+        commands = commands.to_commands()
+    frontier = _Frontier()
+    layers: list[int] = []
+    ends: list[int] = []
+    predecessors: list[int] = []
+    n_gates = 0
+    for index, command in enumerate(commands):
+        qubit_ids = frontier.ids(command.qubits(), frontier.qubit_ids)
+        bit_ids = frontier.ids(command.bits(), frontier.bit_ids)
+        if type(command) is CircBox:
+            summary = box_summary(command._circuit)
+            start, end, predecessor = frontier.place_box(
+                index,
+                qubit_ids + bit_ids,
+                summary,
+            )
+            n_gates += summary.n_gates
+        else:
+            if type(command) is Conditional:
+                # the condition bits are only read
+                start, end, predecessor = frontier.place_gate(
+                    index,
+                    qubit_ids,
+                    bit_ids,
+                )
+            else:
+                start, end, predecessor = frontier.place_gate(
+                    index,
+                    qubit_ids + bit_ids,
+                )
+            n_gates += 1
+        layers.append(start)
+        ends.append(end)
+        predecessors.append(predecessor)
+
+    depth = max(ends, default=0)
+    critical_path = []
+    if depth:
+        index = ends.index(depth)
+        while index >= 0:
+            critical_path.append(index)
+            index = predecessors[index]
+        critical_path.reverse()
+    counts = frontier.counts
+    return CommandAnalysis(
+        depth=depth,
+        n_gates=n_gates,
+        layers=tuple(layers),
+        critical_path=tuple(critical_path),
+        gate_counts={
+            qubit: counts[unit_id] for qubit, unit_id in frontier.qubit_ids.items()
+        },
+    )
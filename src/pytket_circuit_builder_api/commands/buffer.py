@@ -0,0 +1,355 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from pytket import Bit, Circuit, OpType, Qubit
+from pytket._tket.circuit import Op
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.boxes import tket_circbox
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CRz,
+    Rz,
+    _raise_if_operands_missing_from_circuit,
+)
+from pytket_circuit_builder_api.extensions import auto_install_enabled
+from pytket_circuit_builder_api.operand_index import add_qubits
+from pytket_circuit_builder_api.ops import tket_op
+
+
+@dataclass(frozen=True)
+class _GateSpec:
+    op_type: OpType
+    n_qubits: int
+    n_params: int
+    command_type: type
+
+
+_GATE_SPECS: tuple[_GateSpec, ...] = (
+    _GateSpec(OpType.CX, 2, 0, CX),
+    _GateSpec(OpType.Rz, 1, 1, Rz),
+    _GateSpec(OpType.CRz, 2, 1, CRz),
+)
+_OPCODES: dict[OpType, int] = {
+    spec.op_type: opcode for opcode, spec in enumerate(_GATE_SPECS)
+}
+_COMMAND_OPCODES: dict[type, int] = {
+    spec.command_type: opcode for opcode, spec in enumerate(_GATE_SPECS)
+}
+_NO_PARAM = -1
+
+
+def _angle_key(angle: Angle) -> Any:
+    return angle.expr if angle.is_symbolic() else angle.value
+
+
+class CommandBuffer:
+    """Columnar container for a sequence of simple gates.
+
+    Gates are stored as an op-code array, a flat array of indices into a
+    qubit table with per-gate offsets, and indices into a deduplicated table
+    of parameters. Blocks of gates can be added from index arrays without
+    creating a Python object per gate.
+
+    A buffer is itself a command, so it can be an element of the command
+    lists of the builders. It is lowered gate by gate, not as a box.
+    """
+
+    def __init__(self, qubits: Iterable[Qubit] = ()) -> None:
+        """Initialize an empty buffer with an initial qubit table."""
+        self._qubits: list[Qubit] = []
+        self._qubit_ids: dict[Qubit, int] = {}
+        self._params: list[Angle] = []
+        self._param_ids: dict[Any, int] = {}
+        self._opcode_chunks: list[npt.NDArray[np.uint8]] = []
+        self._qubit_chunks: list[npt.NDArray[np.int32]] = []
+        self._arity_chunks: list[npt.NDArray[np.uint8]] = []
+        self._param_chunks: list[npt.NDArray[np.int32]] = []
+        self._n_commands = 0
+        for qubit in qubits:
+            self.qubit_id(qubit)
+
+    @classmethod
+    def from_commands(
+        cls, commands: Iterable[TketCompatibleCommand]
+    ) -> "CommandBuffer":
+        """Build a buffer from CX, Rz and CRz command objects."""
+        buffer = cls()
+        opcodes: list[int] = []
+        qubit_ids: list[int] = []
+        arities: list[int] = []
+        param_ids: list[int] = []
+        for command in commands:
+            opcode = _COMMAND_OPCODES.get(type(command))
+            if opcode is None:
+                raise Exception(
+                    f"Command {command} cannot be stored in a CommandBuffer",
+                )
+            qubits = command.qubits()
+            params = command.params()
+            opcodes.append(opcode)
+            qubit_ids.extend(buffer.qubit_id(qubit) for qubit in qubits)
+            arities.append(len(qubits))
+            param_ids.append(buffer.param_id(params[0]) if params else _NO_PARAM)
+        buffer._add_chunk(
+            np.array(opcodes, dtype=np.uint8),
+            np.array(qubit_ids, dtype=np.int32),
+            np.array(arities, dtype=np.uint8),
+            np.array(param_ids, dtype=np.int32),
+        )
+        return buffer
+
+    def qubit_id(self, qubit: Qubit) -> int:
+        """Return the index of a qubit in the qubit table, adding it if needed."""
+        index = self._qubit_ids.get(qubit)
+        if index is None:
+            index = len(self._qubits)
+            self._qubits.append(qubit)
+            self._qubit_ids[qubit] = index
+        return index
+
+    def param_id(self, angle: Angle) -> int:
+        """Return the index of an angle in the parameter table, adding it if needed."""
+        key = _angle_key(angle)
+        index = self._param_ids.get(key)
+        if index is None:
+            index = len(self._params)
+            self._params.append(angle)
+            self._param_ids[key] = index
+        return index
+
+    def add_gates(
+        self,
+        op_type: OpType,
+        qubit_ids: npt.ArrayLike,
+        params: npt.ArrayLike | Angle | str | None = None,
+    ) -> None:
+        """Add a block of gates of one type.
+
+        Args:
+            op_type: Type of the gates, one of CX, Rz or CRz.
+            qubit_ids: Qubit table indices, of shape (n_gates, n_qubits) or
+                (n_gates,) for single qubit gates.
+            params: Angles of parameterised gates, either one angle used for
+                every gate or an array of n_gates floats.
+        """
+        opcode = _OPCODES.get(op_type)
+        if opcode is None:
+            raise Exception(f"Op type {op_type} cannot be stored in a CommandBuffer")
+        spec = _GATE_SPECS[opcode]
+        ids = np.array(qubit_ids, dtype=np.int32).reshape(-1, spec.n_qubits)
+        n_gates = ids.shape[0]
+        if ids.size and (ids.min() < 0 or ids.max() >= len(self._qubits)):
+            raise Exception("Qubit indices must refer to the qubit table")
+        self._add_chunk(
+            np.full(n_gates, opcode, dtype=np.uint8),
+            ids.ravel(),
+            np.full(n_gates, spec.n_qubits, dtype=np.uint8),
+            self._param_ids_for(spec, n_gates, params),
+        )
+
+    def _param_ids_for(
+        self,
+        spec: _GateSpec,
+        n_gates: int,
+        params: npt.ArrayLike | Angle | str | None,
+    ) -> npt.NDArray[np.int32]:
+        if spec.n_params == 0:
+            if params is not None:
+                raise Exception(f"{spec.op_type} gates take no parameters")
+            return np.full(n_gates, _NO_PARAM, dtype=np.int32)
+        if params is None:
+            raise Exception(f"{spec.op_type} gates require a parameter")
+        if isinstance(params, str):
+            params = Angle(params)
+        if isinstance(params, Angle):
+            return np.full(n_gates, self.param_id(params), dtype=np.int32)
+        values = np.broadcast_to(np.asarray(params, dtype=np.float64), (n_gates,))
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        table_ids = np.array(
+            [self.param_id(Angle(value)) for value in unique_values.tolist()],
+            dtype=np.int32,
+        )
+        return table_ids[inverse.reshape(-1)] if n_gates else table_ids[:0]
+
+    def _add_chunk(
+        self,
+        opcodes: npt.NDArray[np.uint8],
+        qubit_ids: npt.NDArray[np.int32],
+        arities: npt.NDArray[np.uint8],
+        param_ids: npt.NDArray[np.int32],
+    ) -> None:
+        self._opcode_chunks.append(opcodes)
+        self._qubit_chunks.append(qubit_ids)
+        self._arity_chunks.append(arities)
+        self._param_chunks.append(param_ids)
+        self._n_commands += len(opcodes)
+
+    def _compact(self) -> None:
+        if len(self._opcode_chunks) > 1:
+            self._opcode_chunks = [np.concatenate(self._opcode_chunks)]
+            self._qubit_chunks = [np.concatenate(self._qubit_chunks)]
+            self._arity_chunks = [np.concatenate(self._arity_chunks)]
+            self._param_chunks = [np.concatenate(self._param_chunks)]
+
+    @property
+    def opcodes(self) -> npt.NDArray[np.uint8]:
+        """Op code of each gate."""
+        self._compact()
+        if not self._opcode_chunks:
+            return np.zeros(0, dtype=np.uint8)
+        return self._opcode_chunks[0]
+
+    @property
+    def qubit_indices(self) -> npt.NDArray[np.int32]:
+        """Flat qubit table indices of all gates, see qubit_offsets."""
+        self._compact()
+        if not self._qubit_chunks:
+            return np.zeros(0, dtype=np.int32)
+        return self._qubit_chunks[0]
+
+    @property
+    def qubit_offsets(self) -> npt.NDArray[np.int64]:
+        """Start of each gate's qubits in qubit_indices, with a final end offset."""
+        self._compact()
+        offsets = np.zeros(self._n_commands + 1, dtype=np.int64)
+        if self._arity_chunks:
+            np.cumsum(self._arity_chunks[0], out=offsets[1:])
+        return offsets
+
+    @property
+    def param_indices(self) -> npt.NDArray[np.int32]:
+        """Parameter table index of each gate, -1 for gates without parameters."""
+        self._compact()
+        if not self._param_chunks:
+            return np.zeros(0, dtype=np.int32)
+        return self._param_chunks[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the per-gate arrays."""
+        return sum(
+            chunk.nbytes
+            for chunks in (
+                self._opcode_chunks,
+                self._qubit_chunks,
+                self._arity_chunks,
+                self._param_chunks,
+            )
+            for chunk in chunks
+        )
+
+    def relabel(self, qubit_map: dict[Qubit, Qubit]) -> "CommandBuffer":
+        """Return a copy of the buffer with its qubits renamed by qubit_map.
+
+        Only the qubit table is rewritten and the gate arrays are shared with
+        this buffer, unless the map merges qubits of the table, in which case
+        the qubit indices are remapped with a single vectorised lookup.
+        """
+        self._compact()
+        buffer = CommandBuffer(qubit_map.get(qubit, qubit) for qubit in self._qubits)
+        buffer._params = list(self._params)
+        buffer._param_ids = dict(self._param_ids)
+        buffer._opcode_chunks = list(self._opcode_chunks)
+        buffer._arity_chunks = list(self._arity_chunks)
+        buffer._param_chunks = list(self._param_chunks)
+        buffer._n_commands = self._n_commands
+        if len(buffer._qubits) == len(self._qubits):
+            buffer._qubit_chunks = list(self._qubit_chunks)
+        else:
+            remap = np.array(
+                [buffer._qubit_ids[qubit_map.get(q, q)] for q in self._qubits],
+                dtype=np.int32,
+            )
+            buffer._qubit_chunks = [remap[chunk] for chunk in self._qubit_chunks]
+        return buffer
+
+    def __len__(self) -> int:
+        return self._n_commands
+
+    def qubits(self) -> list[Qubit]:
+        """Return the qubit table."""
+        return list(self._qubits)
+
+    def bits(self) -> list[Bit]:
+        """Return no bits, buffers only hold quantum gates."""
+        return []
+
+    def params(self) -> list[Angle]:
+        """Return the parameter table, each distinct angle once."""
+        return list(self._params)
+
+    def tket_op_type(self) -> OpType:
+        """Return CircBox, the type of the op of the whole buffer."""
+        return OpType.CircBox
+
+    def to_tket_op(self) -> Op:
+        """Return a tket CircBox holding the gates of the buffer."""
+        return tket_circbox(from_command_buffer_func(self))
+
+    def sub(
+        self,
+        qubit_subs: dict[Qubit, Qubit] = {},
+        bit_subs: dict[Bit, Bit] = {},
+    ) -> "CommandBuffer":
+        """Return the buffer with its qubits substituted, see relabel."""
+        return self.relabel(qubit_subs)
+
+    def _rows(self) -> Iterable[tuple[int, list[Qubit], int]]:
+        opcodes = self.opcodes.tolist()
+        offsets = self.qubit_offsets.tolist()
+        qubit_ids = self.qubit_indices.tolist()
+        param_ids = self.param_indices.tolist()
+        qubits = self._qubits
+        for i, opcode in enumerate(opcodes):
+            gate_qubits = [qubits[j] for j in qubit_ids[offsets[i] : offsets[i + 1]]]
+            yield opcode, gate_qubits, param_ids[i]
+
+    def to_commands(self) -> list[TketCompatibleCommand]:
+        """Convert the buffer into a list of command objects."""
+        commands: list[TketCompatibleCommand] = []
+        for opcode, gate_qubits, param_id in self._rows():
+            command_type = _GATE_SPECS[opcode].command_type
+            if param_id == _NO_PARAM:
+                commands.append(command_type(*gate_qubits))
+            else:
+                commands.append(command_type(self._params[param_id], *gate_qubits))
+        return commands
+
+    def append_to_tket_circuit(self, circuit: Circuit) -> None:
+        """Append all gates to circuit, qubits must be present."""
+        _raise_if_operands_missing_from_circuit(circuit, self._qubits)
+        ops: dict[tuple[int, int], Op] = {}
+        for opcode, gate_qubits, param_id in self._rows():
+            op = ops.get((opcode, param_id))
+            if op is None:
+                op_type = _GATE_SPECS[opcode].op_type
+                if param_id == _NO_PARAM:
+                    op = tket_op(op_type)
+                else:
+                    op = tket_op(op_type, (self._params[param_id].param,))
+                ops[(opcode, param_id)] = op
+            circuit.add_gate(op, gate_qubits)
+
+
+def from_command_buffer_func(buffer: CommandBuffer) -> Circuit:
+    """Construct a circuit from a command buffer, adding its qubits."""
+    circuit = Circuit()
+    add_qubits(circuit, buffer.qubits())
+    buffer.append_to_tket_circuit(circuit)
+    return circuit
+
+
+def install() -> None:
+    """Add Circuit.from_command_buffer to pytket Circuit."""
+    Circuit.from_command_buffer = from_command_buffer_func  # type: ignore[attr-defined]
+
+
+if auto_install_enabled():
+    install()
@@ -1,15 +1,25 @@
-from collections.abc import Iterable
-from typing import Protocol, Self
+import itertools
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol, Self
 
 from pytket import Bit, Circuit, OpType, Qubit
 from pytket._tket.circuit import Op
 
 from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.extensions import auto_install_enabled
+from pytket_circuit_builder_api.operand_index import add_bits, add_qubits
+
+if TYPE_CHECKING:
+    from pytket_circuit_builder_api.commands.peephole import PeepholeOptimizer
 
 
 class Command(Protocol):
     """Protocol for circuit commands."""
 
+    __slots__ = ()
+
     def sub(
         self,
         qubit_subs: dict[Qubit, Qubit] = {},
@@ -22,6 +32,8 @@ class Command(Protocol):
 class TketCompatibleCommand(Command, Protocol):
     """Protocol for circuit commands."""
 
+    __slots__ = ()
+
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         """Append command to circuit."""
 
@@ -51,22 +63,113 @@ def append_func(self: Circuit, command: TketCompatibleCommand) -> None:
     command.append_to_tket_circuit(self)
 
 
-def extend_func(self: Circuit, command: Iterable[TketCompatibleCommand]) -> None:
-    """Add operations to circuit, qubits must be present."""
+def extend_func(
+    self: Circuit,
+    command: Iterable[TketCompatibleCommand],
+    peephole: "PeepholeOptimizer | None" = None,
+) -> None:
+    """Add operations to circuit, qubits must be present.
+
+    With a peephole optimizer, redundant gates are removed from the
+    operations before they are added.
+    """
+    if peephole is not None:
+        command = peephole.optimize(command)
     for operation in command:
         operation.append_to_tket_circuit(self)
 
 
-def from_operation_list_func(commands: Iterable[TketCompatibleCommand]) -> Circuit:
-    """Construct a circuit from a list of operations, add qubits as needed."""
+def _adding_qubits(
+    circuit: Circuit,
+    commands: Iterable[TketCompatibleCommand],
+) -> Iterator[TketCompatibleCommand]:
+    for command in commands:
+        add_qubits(circuit, command.qubits())
+        yield command
+
+
+def from_operation_list_func(
+    commands: Iterable[TketCompatibleCommand],
+    peephole: "PeepholeOptimizer | None" = None,
+) -> Circuit:
+    """Construct a circuit from a list of operations, add qubits as needed.
+
+    With a peephole optimizer, redundant gates are removed from the
+    operations before they are added. The circuit still gets the qubits of
+    removed gates.
+    """
     circuit = Circuit()
+    if peephole is not None:
+        for command in peephole.optimize(_adding_qubits(circuit, commands)):
+            command.append_to_tket_circuit(circuit)
+        return circuit
     for command in commands:
-        for qubit in command.qubits():
-            circuit.add_qubit(qubit, reject_dups=False)
+        add_qubits(circuit, command.qubits())
         command.append_to_tket_circuit(circuit)
     return circuit
 
 
-Circuit.add_command = append_func
-Circuit.extend = extend_func
-Circuit.from_operation_list = from_operation_list_func
+@dataclass(frozen=True)
+class BuildProgress:
+    """Progress of a streaming circuit construction."""
+
+    n_commands: int
+    elapsed: float
+
+    @property
+    def commands_per_second(self) -> float:
+        """Average throughput so far."""
+        return self.n_commands / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def stream_chunks(
+    commands: Iterable[Any],
+    chunk_size: int,
+    lower_chunk: Callable[[list[Any]], None],
+    progress: Callable[[BuildProgress], None] | None,
+) -> None:
+    """Pull commands in chunks of chunk_size, lowering and reporting each chunk."""
+    if chunk_size < 1:
+        raise Exception("Chunk size must be positive")
+    iterator = iter(commands)
+    start = time.perf_counter()
+    n_commands = 0
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        lower_chunk(chunk)
+        n_commands += len(chunk)
+        if progress is not None:
+            progress(BuildProgress(n_commands, time.perf_counter() - start))
+
+
+def from_operation_stream_func(
+    commands: Iterable[TketCompatibleCommand],
+    chunk_size: int = 10_000,
+    progress: Callable[[BuildProgress], None] | None = None,
+) -> Circuit:
+    """Construct a circuit from a stream of operations, lowering it in chunks.
+
+    Only one chunk of commands is held at a time. Qubits and bits are added
+    as they first appear and progress is reported after every chunk.
+    """
+    circuit = Circuit()
+
+    def lower_chunk(chunk: list[TketCompatibleCommand]) -> None:
+        for command in chunk:
+            add_qubits(circuit, command.qubits())
+            add_bits(circuit, command.bits())
+            command.append_to_tket_circuit(circuit)
+
+    stream_chunks(commands, chunk_size, lower_chunk, progress)
+    return circuit
+
+
+def install() -> None:
+    """Add the commands API methods to pytket Circuit."""
+    Circuit.add_command = append_func  # type: ignore[attr-defined]
+    Circuit.extend = extend_func  # type: ignore[attr-defined]
+    Circuit.from_operation_list = from_operation_list_func  # type: ignore[attr-defined]
+    Circuit.from_operation_stream = from_operation_stream_func  # type: ignore[attr-defined]
+
+
+if auto_install_enabled():
+    install()
@@ -1,18 +1,21 @@
 import functools
 import inspect
 from collections.abc import Callable, Iterable, Sequence
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Any, Self, TypeVar
 
 from pytket import Bit, Circuit, OpType, Qubit
-from pytket._tket.circuit import CircBox as TketCircBox
-from pytket._tket.circuit import Op, QControlBox
+from pytket._tket.circuit import Op
 from pytket._tket.unit_id import BitRegister, QubitRegister
 
 from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.boxes import circuit_digest, qcontrol_box, tket_circbox
+from pytket_circuit_builder_api.cache import CacheStats, LRUCache
 from pytket_circuit_builder_api.commands.command_interface import (
     TketCompatibleCommand,
 )
+from pytket_circuit_builder_api.operand_index import missing_operands
+from pytket_circuit_builder_api.ops import tket_op
 
 Oprnd = TypeVar("Oprnd", Qubit, Bit)
 
@@ -25,13 +28,9 @@ def _raise_if_operands_missing_from_circuit(
     circuit: Circuit,
     operands: Sequence[Qubit | Bit],
 ) -> None:
-    circuit_operands: list[Qubit | Bit] = circuit.qubits + circuit.bits
-    missing_operands: list[Qubit | Bit] = []
-    for operand in operands:
-        if operand not in circuit_operands:
-            missing_operands.append(operand)
-    msg = f"Operands {missing_operands} are not contained in circuit"
-    if missing_operands:
+    missing = missing_operands(circuit, operands)
+    msg = f"Operands {missing} are not contained in circuit"
+    if missing:
         raise Exception(msg)
 
 
@@ -39,14 +38,55 @@ def _sub(operand: Oprnd, subs: dict[Oprnd, Oprnd]) -> Oprnd:
     return subs.get(operand, operand)
 
 
-@dataclass(frozen=True)
+def structural_key(command: TketCompatibleCommand) -> Any:
+    """Return a hashable key which is equal for structurally equal commands."""
+    key = getattr(command, "structural_key", None)
+    return command if key is None else key()
+
+
+# the operands of a plan are qubits or bits depending on their slot, which
+# the annotation cannot express
+SubPlan = Callable[[Sequence[Any]], TketCompatibleCommand]
+
+
+def _compile_sub(
+    command: TketCompatibleCommand,
+    slots: dict[Qubit | Bit, int],
+) -> SubPlan:
+    """Return a function building command with its operands taken from slots.
+
+    Commands can provide a specialised compile_sub, otherwise (or if it
+    returns None, or an operand has no slot) the plan falls back to calling
+    sub.
+    """
+    compile_sub = getattr(command, "compile_sub", None)
+    if compile_sub is not None:
+        try:
+            compiled = compile_sub(slots)
+        except KeyError:
+            compiled = None
+        if compiled is not None:
+            return compiled
+    qubit_slots = [(u, i) for u, i in slots.items() if isinstance(u, Qubit)]
+    bit_slots = [(u, i) for u, i in slots.items() if isinstance(u, Bit)]
+
+    def plan(operands: Sequence[Any]) -> TketCompatibleCommand:
+        return command.sub(
+            {qubit: operands[i] for qubit, i in qubit_slots},
+            {bit: operands[i] for bit, i in bit_slots},
+        )
+
+    return plan
+
+
+@dataclass(frozen=True, slots=True)
 class CX(TketCompatibleCommand):
     target: Qubit
     control: Qubit
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         _raise_if_operands_missing_from_circuit(circuit, self.qubits())
-        circuit.add_gate(self.tket_op_type(), [self.target, self.control])
+        circuit.add_gate(self.to_tket_op(), [self.target, self.control])
 
     def sub(
         self,
@@ -55,6 +95,13 @@ class CX(TketCompatibleCommand):
     ) -> Self:
         return CX(_sub(self.target, qubit_subs), _sub(self.control, qubit_subs))
 
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan:
+        target, control = slots[self.target], slots[self.control]
+        return lambda operands: CX(operands[target], operands[control])
+
+    def structural_key(self) -> tuple[Any, ...]:
+        return ("CX", self.target, self.control)
+
     def params(self) -> list[Angle]:
         return []
 
@@ -68,17 +115,17 @@ class CX(TketCompatibleCommand):
         return OpType.CX
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type())
+        return tket_op(self.tket_op_type())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rz(TketCompatibleCommand):
     angle: Angle
     qubit: Qubit
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         _raise_if_operands_missing_from_circuit(circuit, self.qubits())
-        circuit.add_gate(self.tket_op_type(), self.angle.expr, [self.qubit])
+        circuit.add_gate(self.to_tket_op(), [self.qubit])
 
     def sub(
         self,
@@ -87,6 +134,13 @@ class Rz(TketCompatibleCommand):
     ) -> Self:
         return Rz(self.angle, _sub(self.qubit, qubit_subs))
 
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan:
+        angle, qubit = self.angle, slots[self.qubit]
+        return lambda operands: Rz(angle, operands[qubit])
+
+    def structural_key(self) -> tuple[Any, ...]:
+        return ("Rz", self.angle, self.qubit)
+
     def params(self) -> list[Angle]:
         return [self.angle]
 
@@ -100,10 +154,10 @@ class Rz(TketCompatibleCommand):
         return OpType.Rz
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type(), self.angle.expr)
+        return tket_op(self.tket_op_type(), (self.angle.param,))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CRz(TketCompatibleCommand):
     angle: Angle
     target: Qubit
@@ -111,11 +165,7 @@ class CRz(TketCompatibleCommand):
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         _raise_if_operands_missing_from_circuit(circuit, self.qubits())
-        circuit.add_gate(
-            self.tket_op_type(),
-            self.angle.expr,
-            [self.target, self.control],
-        )
+        circuit.add_gate(self.to_tket_op(), [self.target, self.control])
 
     def sub(
         self,
@@ -128,6 +178,13 @@ class CRz(TketCompatibleCommand):
             _sub(self.control, qubit_subs),
         )
 
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan:
+        angle, target, control = self.angle, slots[self.target], slots[self.control]
+        return lambda operands: CRz(angle, operands[target], operands[control])
+
+    def structural_key(self) -> tuple[Any, ...]:
+        return ("CRz", self.angle, self.target, self.control)
+
     def params(self) -> list[Angle]:
         return [self.angle]
 
@@ -141,17 +198,17 @@ class CRz(TketCompatibleCommand):
         return OpType.CRz
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type(), self.angle.expr)
+        return tket_op(self.tket_op_type(), (self.angle.param,))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QControlled(TketCompatibleCommand):
     command: TketCompatibleCommand
     control_qubits: Sequence[Qubit]
-    control_state: Sequence[bool] = field(default_factory=list)
-    _box: QControlBox | None = field(init=False, default=None)
+    control_state: Sequence[bool] = ()
 
     def __post_init__(self):
+        object.__setattr__(self, "control_qubits", tuple(self.control_qubits))
         if not _is_unique_list(self.qubits()):
             raise Exception("Operands aren't unique")
         if self.control_state:
@@ -159,20 +216,22 @@ class QControlled(TketCompatibleCommand):
                 raise Exception(
                     "Control state length must match number of  control qubits",
                 )
+            object.__setattr__(self, "control_state", tuple(self.control_state))
         else:
-            self.control_state = [True for _ in self.control_qubits]
+            object.__setattr__(
+                self,
+                "control_state",
+                tuple(True for _ in self.control_qubits),
+            )
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         _raise_if_operands_missing_from_circuit(circuit, self.qubits())
-
-        if not self._box:
-            self._box = QControlBox(
-                self.command.to_tket_op(),
-                n_controls=len(self.control_qubits),
-                control_state=self.control_state,
-            )
-        assert self._box is not None
-        circuit.add_qcontrolbox(self._box, self.qubits())
+        box = qcontrol_box(
+            self.command.to_tket_op(),
+            n_controls=len(self.control_qubits),
+            control_state=self.control_state,
+        )
+        circuit.add_qcontrolbox(box, self.qubits())
 
     def sub(
         self,
@@ -180,13 +239,36 @@ class QControlled(TketCompatibleCommand):
         bit_subs: dict[Bit, Bit] = {},
     ) -> Self:
         new_command = self.command.sub(qubit_subs, bit_subs)
-        new_controls = [
+        new_controls = tuple(
             qubit_subs.get(old_control, old_control)
             for old_control in self.control_qubits
-        ]
-        result = QControlled(new_command, new_controls)
-        result._box = self._box
-        return result
+        )
+        return QControlled(new_command, new_controls, self.control_state)
+
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan:
+        command_plan = _compile_sub(self.command, slots)
+        controls = [slots[control] for control in self.control_qubits]
+        control_state = self.control_state
+
+        def plan(operands: Sequence[Any]) -> QControlled:
+            return QControlled(
+                command_plan(operands),
+                tuple(operands[i] for i in controls),
+                control_state,
+            )
+
+        return plan
+
+    def structural_key(self) -> tuple[Any, ...]:
+        return (
+            "QControlled",
+            structural_key(self.command),
+            self.control_qubits,
+            self.control_state,
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.structural_key())
 
     def params(self) -> list[Angle]:
         return self.command.params()
@@ -210,48 +292,86 @@ class CircBox(TketCompatibleCommand):
     def __init__(self, circuit: Circuit) -> None:
         reverse_qubit_map: dict[Qubit, Qubit] = {}
         qubit_counter = 0
-        self._qubits: list[Qubit] = []
+        qubits: list[Qubit] = []
         for qubit in circuit.qubits:
-            self._qubits.append(qubit)
+            qubits.append(qubit)
             reverse_qubit_map[qubit] = Qubit(qubit_counter)
             qubit_counter += 1
 
         reverse_bit_map: dict[Bit, Bit] = {}
         bit_counter = 0
-        self._bits: list[Bit] = []
+        bits: list[Bit] = []
         for bit in circuit.bits:
-            self._bits.append(bit)
+            bits.append(bit)
             reverse_bit_map[bit] = Bit(bit_counter)
             bit_counter += 1
 
+        # instances can be shared (by template caches), so operands are tuples
+        self._qubits: tuple[Qubit, ...] = tuple(qubits)
+        self._bits: tuple[Bit, ...] = tuple(bits)
         self._circuit = circuit.copy()
         # make self._circuit simple
         self._circuit.rename_units(reverse_qubit_map)
         self._circuit.rename_units(reverse_bit_map)
+        # one tket box per definition, shared by every instance derived with sub
+        self._tket_box = tket_circbox(self._circuit)
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
-        _raise_if_operands_missing_from_circuit(circuit, self.qubits() + self._bits)
-        circuit.add_circbox(TketCircBox(self._circuit), self.qubits())
+        _raise_if_operands_missing_from_circuit(circuit, self._qubits + self._bits)
+        circuit.add_circbox(self._tket_box, self._qubits)
 
     def sub(
         self,
         qubit_subs: dict[Qubit, Qubit] = {},
         bit_subs: dict[Bit, Bit] = {},
     ) -> Self:
-        new_circuit_op = CircBox(Circuit())
+        return self._with_operands(
+            [_sub(qubit, qubit_subs) for qubit in self._qubits],
+            [_sub(bit, bit_subs) for bit in self._bits],
+        )
+
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan:
+        qubit_slots = [slots[qubit] for qubit in self._qubits]
+        bit_slots = [slots[bit] for bit in self._bits]
+        return lambda operands: self._with_operands(
+            [operands[i] for i in qubit_slots],
+            [operands[i] for i in bit_slots],
+        )
+
+    def _with_operands(self, qubits: Sequence[Qubit], bits: Sequence[Bit]) -> Self:
+        # instances are never mutated after creation, so the definition
+        # (inner circuit and tket box) is shared rather than copied
+        new_circuit_op = CircBox.__new__(CircBox)
         new_circuit_op._circuit = self._circuit
-        new_circuit_op._qubits = [_sub(qubit, qubit_subs) for qubit in self._qubits]
-        new_circuit_op._bits = [_sub(bit, bit_subs) for bit in self._bits]
+        new_circuit_op._tket_box = self._tket_box
+        new_circuit_op._qubits = tuple(qubits)
+        new_circuit_op._bits = tuple(bits)
         return new_circuit_op
 
+    def structural_key(self) -> tuple[Any, ...]:
+        return (
+            "CircBox",
+            circuit_digest(self._circuit),
+            self._qubits,
+            self._bits,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CircBox):
+            return NotImplemented
+        return self.structural_key() == other.structural_key()
+
+    def __hash__(self) -> int:
+        return hash(self.structural_key())
+
     def params(self) -> list[Angle]:
         return []
 
     def qubits(self) -> list[Qubit]:
-        return self._qubits
+        return list(self._qubits)
 
     def bits(self) -> list[Bit]:
-        return self._bits
+        return list(self._bits)
 
     def tket_op_type(self) -> OpType:
         return OpType.CircBox
@@ -266,6 +386,8 @@ class CommandTemplate:
         template_command: TketCompatibleCommand,
         template_qubits: Sequence[Qubit],
         template_bits: Sequence[Bit] = [],
+        cache_size: int = 0,
+        name: str | None = None,
     ) -> None:
         if set(template_command.qubits()) != set(template_qubits):
             raise Exception(
@@ -280,6 +402,18 @@ class CommandTemplate:
         self.template_qubits = template_qubits
         self.template_bits = template_bits
         self.template_command = template_command
+        self.name = name or type(template_command).__name__
+        self._ordered_plan: SubPlan | None = None
+        # instantiated commands are immutable, so they can be shared per operands
+        self.cache: LRUCache[TketCompatibleCommand] | None = (
+            LRUCache(maxsize=cache_size) if cache_size else None
+        )
+
+    def cache_stats(self) -> CacheStats | None:
+        """Return the statistics of the instantiation cache, if enabled."""
+        if self.cache is None:
+            return None
+        return self.cache.stats()
 
     def apply_to(
         self,
@@ -292,10 +426,61 @@ class CommandTemplate:
             )
         if len(bits) != len(self.template_bits):
             raise Exception("Number of provided bits must match number in the template")
+        if self.cache is not None:
+            # the canonical key, shared with the plans returned by compile
+            return self.cache.get_or_create(
+                (*qubits, *bits),
+                lambda: self._apply_to(qubits, bits),
+            )
+        return self._apply_to(qubits, bits)
+
+    def _apply_to(
+        self,
+        qubits: Sequence[Qubit],
+        bits: Sequence[Bit],
+    ) -> TketCompatibleCommand:
         qubit_sub_map = {self.template_qubits[i]: qubits[i] for i in range(len(qubits))}
         bit_sub_map = {self.template_bits[i]: bits[i] for i in range(len(bits))}
         return self.template_command.sub(qubit_sub_map, bit_sub_map)
 
+    def compile(self, operand_order: Sequence[Qubit | Bit]) -> SubPlan:
+        """Return a function applying the template to operands given in order.
+
+        The operand order lists the template qubits and bits in the order
+        the returned function receives them.
+        """
+        slots = {operand: i for i, operand in enumerate(operand_order)}
+        if set(slots) != set(self.template_qubits) | set(self.template_bits):
+            raise Exception("Operand order must list every templated qubit and bit")
+        plan = _compile_sub(self.template_command, slots)
+        cache = self.cache
+        if cache is None:
+            return plan
+        # cache under the key used by apply_to: qubits, then bits, in
+        # template order
+        key_order = [slots[qubit] for qubit in self.template_qubits] + [
+            slots[bit] for bit in self.template_bits
+        ]
+        if key_order == list(range(len(key_order))):
+            return lambda operands: cache.get_or_create(
+                tuple(operands),
+                lambda: plan(operands),
+            )
+        return lambda operands: cache.get_or_create(
+            tuple([operands[i] for i in key_order]),
+            lambda: plan(operands),
+        )
+
+    def bind_operand_order(self, operand_order: Sequence[Qubit | Bit]) -> None:
+        """Compile the template for apply_in_order, see compile."""
+        self._ordered_plan = self.compile(operand_order)
+
+    def apply_in_order(self, operands: Sequence[Qubit | Bit]) -> TketCompatibleCommand:
+        """Apply the template to operands in the order given to bind_operand_order."""
+        if self._ordered_plan is None:
+            raise Exception("bind_operand_order must be called before apply_in_order")
+        return self._ordered_plan(operands)
+
 
 def split_qubits_bits(mylist: Sequence[Qubit | Bit]) -> tuple[list[Qubit], list[Bit]]:
     qubits = []
@@ -308,12 +493,34 @@ def split_qubits_bits(mylist: Sequence[Qubit | Bit]) -> tuple[list[Qubit], list[
     return qubits, bits
 
 
+def _operand_layout(operands: Sequence[Qubit | Bit]) -> tuple[type, ...]:
+    return tuple(Qubit if isinstance(operand, Qubit) else Bit for operand in operands)
+
+
+def _matches_layout(args: Sequence[Any], layout: tuple[type, ...]) -> bool:
+    # the positional fast path skips the checks of apply_to, so only take it
+    # when every operand has the type of its parameter
+    if len(args) != len(layout):
+        return False
+    for arg, operand_type in zip(args, layout):
+        if not isinstance(arg, operand_type):
+            return False
+    return True
+
+
 def pytket_operator(
-    func: Callable[
-        [QubitRegister | BitRegister | Qubit | Bit, ...],
-        TketCompatibleCommand,
-    ],
+    func: (
+        Callable[
+            [QubitRegister | BitRegister | Qubit | Bit, ...],
+            TketCompatibleCommand,
+        ]
+        | None
+    ) = None,
+    *,
+    cache_size: int = 0,
 ):
+    if func is None:
+        return functools.partial(pytket_operator, cache_size=cache_size)
     n_qubits = 0
     n_bits = 0
     func_signature = inspect.signature(func)
@@ -335,21 +542,46 @@ def pytket_operator(
         template_qubits=initial_qubits,
         template_bits=initial_bits,
         template_command=func(*initial_args),
+        cache_size=cache_size,
+        name=func.__qualname__,
     )
 
+    command_template.bind_operand_order(initial_args)
+    layout = _operand_layout(initial_args)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         nonlocal func_signature
         nonlocal command_template
+        if not kwargs and _matches_layout(args, layout):
+            return command_template.apply_in_order(args)
         bound_args = func_signature.bind(*args, **kwargs)
         qubits, bits = split_qubits_bits(bound_args.args)
         return command_template.apply_to(qubits, bits)
 
+    wrapper.command_template = command_template  # type: ignore[attr-defined]
     return wrapper
 
 
-def pytket_circbox(func: Callable[..., Iterable[TketCompatibleCommand]]):
-    """Define a pytket CircBox object."""
+def pytket_circbox(
+    func: Callable[..., Iterable[TketCompatibleCommand]] | None = None,
+    *,
+    cache_size: int = 0,
+    circuit_cache: Any = None,
+):
+    """Define a pytket CircBox object.
+
+    With a non-zero cache_size, calls on the same operands return the same
+    (immutable) CircBox instance from a per-definition LRU cache. A
+    circuit_cache (such as a CircuitDiskCache) lets the body circuit be loaded
+    instead of built.
+    """
+    if func is None:
+        return functools.partial(
+            pytket_circbox,
+            cache_size=cache_size,
+            circuit_cache=circuit_cache,
+        )
     circuit = Circuit()
     n_qubits = 0
     n_bits = 0
@@ -371,8 +603,15 @@ def pytket_circbox(func: Callable[..., Iterable[TketCompatibleCommand]]):
                 "Function parameters must be annotated with the types Qubit or Bit",
             )
 
-    for command in func(*initial_args):
-        circuit.add_command(command)
+    def build_body() -> Circuit:
+        for command in func(*initial_args):
+            command.append_to_tket_circuit(circuit)
+        return circuit
+
+    if circuit_cache is None:
+        circuit = build_body()
+    else:
+        circuit = circuit_cache.get_or_build_function(func, build_body)
 
     qubits, bits = split_qubits_bits(initial_args)
 
@@ -380,14 +619,22 @@ def pytket_circbox(func: Callable[..., Iterable[TketCompatibleCommand]]):
         template_qubits=qubits,
         template_bits=bits,
         template_command=CircBox(circuit),
+        cache_size=cache_size,
+        name=func.__qualname__,
     )
 
+    command_template.bind_operand_order(initial_args)
+    layout = _operand_layout(initial_args)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         nonlocal command_template
         nonlocal func_signature
+        if not kwargs and _matches_layout(args, layout):
+            return command_template.apply_in_order(args)
         bound_args = func_signature.bind(*args, **kwargs)
         qubits_called, bits_called = split_qubits_bits(bound_args.args)
         return command_template.apply_to(qubits_called, bits_called)
 
+    wrapper.command_template = command_template  # type: ignore[attr-defined]
     return wrapper
@@ -1,31 +1,93 @@
+import copy
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Self
+from typing import Any, Self
 
 from pytket import Bit, Circuit, OpType, Qubit
 from pytket._tket.circuit import Op
-from pytket.circuit.logic_exp import BitLogicExp, PredicateExp
+from pytket._tket.unit_id import BitRegister
+from pytket.circuit.logic_exp import BitLogicExp, LogicExp, PredicateExp
 
 from pytket_circuit_builder_api.angle import Angle
 from pytket_circuit_builder_api.commands.command_interface import TketCompatibleCommand
 from pytket_circuit_builder_api.commands.commands import (
+    SubPlan,
+    _compile_sub,
     _raise_if_operands_missing_from_circuit,
     _sub,
+    structural_key,
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QasmCondition:
     bits: Sequence[Bit]
     value: int
 
+    def __post_init__(self):
+        object.__setattr__(self, "bits", tuple(self.bits))
 
-@dataclass(frozen=True)
+    def sub(self, bit_subs: dict[Bit, Bit]) -> "QasmCondition":
+        """Return the condition with its bits substituted, self if unchanged."""
+        bits = tuple(_sub(bit, bit_subs) for bit in self.bits)
+        if all(new is old for new, old in zip(bits, self.bits)):
+            return self
+        return QasmCondition(bits, self.value)
+
+
+@dataclass(frozen=True, slots=True)
 class PytketCondition:
     expression: PredicateExp | Bit | BitLogicExp  # this probably should be changed
 
+    def sub(self, bit_subs: dict[Bit, Bit]) -> "PytketCondition":
+        """Return the condition with its bits substituted, self if unchanged.
+
+        Registers in register-wise predicates are renamed when their bits map
+        in order onto the bits of another register of the same size, other
+        maps of their bits raise a ValueError.
+        """
+        expression = self.expression
+        if isinstance(expression, Bit):
+            new_bit = _sub(expression, bit_subs)
+            return self if new_bit is expression else PytketCondition(new_bit)
+        if not any(
+            bit in bit_subs
+            for argument in expression.all_inputs()
+            for bit in ((argument,) if isinstance(argument, Bit) else argument)
+        ):
+            return self
+        # expressions are renamed in place and may be shared
+        expression = copy.deepcopy(expression)
+        _sub_expression(expression, bit_subs)
+        return PytketCondition(expression)
+
+
+def _sub_register(register: BitRegister, bit_subs: dict[Bit, Bit]) -> BitRegister:
+    bits = list(register)
+    new_bits = [_sub(bit, bit_subs) for bit in bits]
+    if all(new is old for new, old in zip(new_bits, bits)):
+        return register
+    name = new_bits[0].reg_name
+    if any(bit.reg_name != name or bit.index != [i] for i, bit in enumerate(new_bits)):
+        raise ValueError(
+            f"Bits of {register!r} must map in order onto the bits of one "
+            "register, it is used in a register-wise expression",
+        )
+    return BitRegister(name, register.size)
 
-@dataclass(frozen=True)
+
+def _sub_expression(expression: LogicExp, bit_subs: dict[Bit, Bit]) -> None:
+    args = expression.args
+    for i, argument in enumerate(args):
+        if isinstance(argument, Bit):
+            args[i] = _sub(argument, bit_subs)
+        elif isinstance(argument, BitRegister):
+            args[i] = _sub_register(argument, bit_subs)
+        elif isinstance(argument, LogicExp):
+            _sub_expression(argument, bit_subs)
+
+
+@dataclass(frozen=True, slots=True)
 class Conditional(TketCompatibleCommand):
     command: TketCompatibleCommand
     condition: QasmCondition | PytketCondition
@@ -53,15 +115,35 @@ class Conditional(TketCompatibleCommand):
         qubit_subs: dict[Qubit, Qubit] = {},
         bit_subs: dict[Bit, Bit] = {},
     ) -> Self:
-        """To do (condition stuff makes it a bit annoying)."""
         new_command = self.command.sub(qubit_subs, bit_subs)
-        if isinstance(self.condition, QasmCondition):
-            new_condition = QasmCondition(
-                bits=[_sub(c, bit_subs) for c in self.condition.bits],
-                value=self.condition.value,
+        return Conditional(new_command, self.condition.sub(bit_subs))
+
+    def compile_sub(self, slots: dict[Qubit | Bit, int]) -> SubPlan | None:
+        if not isinstance(self.condition, QasmCondition):
+            # pytket conditions are substituted by the generic sub
+            return None
+        command_plan = _compile_sub(self.command, slots)
+        condition_bits = [slots[bit] for bit in self.condition.bits]
+        value = self.condition.value
+
+        def plan(operands: Sequence[Any]) -> Conditional:
+            return Conditional(
+                command_plan(operands),
+                QasmCondition(tuple(operands[i] for i in condition_bits), value),
             )
-            return Conditional(new_command, new_condition)
-        raise NotImplementedError
+
+        return plan
+
+    def structural_key(self) -> tuple[Any, ...]:
+        condition_key: tuple[Any, ...]
+        if isinstance(self.condition, QasmCondition):
+            condition_key = ("Qasm", self.condition.bits, self.condition.value)
+        else:
+            condition_key = ("Pytket", str(self.condition.expression))
+        return ("Conditional", structural_key(self.command), condition_key)
+
+    def __hash__(self) -> int:
+        return hash(self.structural_key())
 
     def params(self) -> list[Angle]:
         return self.command.params()
@@ -72,9 +154,17 @@ class Conditional(TketCompatibleCommand):
     def bits(self) -> list[Bit]:
         if isinstance(self.condition, QasmCondition):
             return list(self.condition.bits)
-        else:
-            # this isn't correct, but I can't be bothered (it's complicated)
-            return []
+        expression = self.condition.expression
+        if isinstance(expression, Bit):
+            return [expression]
+        bits: list[Bit] = []
+        for argument in expression.all_inputs_ordered():
+            # register predicates depend on every bit of the register
+            if isinstance(argument, Bit):
+                bits.append(argument)
+            else:
+                bits.extend(argument)
+        return bits
 
     def tket_op_type(self) -> OpType:
         return OpType.Conditional
@@ -0,0 +1,102 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from pytket import Bit, Circuit, OpType, Qubit
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.operand_index import add_bits, add_qubits
+
+
+class DeferredCircuit:
+    """Record commands and only lower them into a tket Circuit on demand.
+
+    Queries such as the units, parameters, gate counts and a depth estimate
+    are answered from the recorded commands. ``materialize`` builds the
+    circuit in one pass and, when called again, only lowers the commands
+    added since the previous call.
+    """
+
+    def __init__(self, commands: Iterable[TketCompatibleCommand] = ()) -> None:
+        """Initialize, recording the given commands."""
+        self._commands: list[TketCompatibleCommand] = []
+        self._qubits: dict[Qubit, None] = {}
+        self._bits: dict[Bit, None] = {}
+        self._gate_counts: Counter[OpType] = Counter()
+        # depth reached on each unit so far, for the depth estimate
+        self._frontier: dict[Qubit | Bit, int] = {}
+        self._depth = 0
+        self._circuit: Circuit | None = None
+        self._n_lowered = 0
+        self.extend(commands)
+
+    def add_command(self, command: TketCompatibleCommand) -> None:
+        """Record a command."""
+        self._commands.append(command)
+        qubits = command.qubits()
+        bits = command.bits()
+        self._qubits.update(dict.fromkeys(qubits))
+        self._bits.update(dict.fromkeys(bits))
+        self._gate_counts[command.tket_op_type()] += 1
+
+        frontier = self._frontier
+        units: list[Qubit | Bit] = [*qubits, *bits]
+        depth = 1 + max((frontier.get(unit, 0) for unit in units), default=0)
+        for unit in units:
+            frontier[unit] = depth
+        self._depth = max(self._depth, depth)
+
+    def extend(self, commands: Iterable[TketCompatibleCommand]) -> None:
+        """Record several commands."""
+        for command in commands:
+            self.add_command(command)
+
+    def qubits(self) -> list[Qubit]:
+        """Return the qubits used by the commands, in order of appearance."""
+        return list(self._qubits)
+
+    def bits(self) -> list[Bit]:
+        """Return the bits used by the commands, in order of appearance."""
+        return list(self._bits)
+
+    def params(self) -> list[Angle]:
+        """Return the parameters of all commands."""
+        return [param for command in self._commands for param in command.params()]
+
+    def gate_counts(self) -> dict[OpType, int]:
+        """Return the number of commands of each tket op type."""
+        return dict(self._gate_counts)
+
+    def depth_estimate(self) -> int:
+        """Return the depth of the commands, counting every command as one layer.
+
+        Boxes count as a single layer, so this can be lower than the depth of
+        the decomposed circuit.
+        """
+        return self._depth
+
+    def commands(self) -> list[TketCompatibleCommand]:
+        """Return the recorded commands."""
+        return list(self._commands)
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether every recorded command has been lowered."""
+        return self._circuit is not None and self._n_lowered == len(self._commands)
+
+    def materialize(self) -> Circuit:
+        """Return the tket circuit, lowering any commands not yet lowered."""
+        if self._circuit is None:
+            self._circuit = Circuit()
+        circuit = self._circuit
+        add_qubits(circuit, self._qubits)
+        add_bits(circuit, self._bits)
+        for command in self._commands[self._n_lowered :]:
+            command.append_to_tket_circuit(circuit)
+            self._n_lowered += 1
+        return circuit
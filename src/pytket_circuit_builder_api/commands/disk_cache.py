@@ -0,0 +1,305 @@
+import contextlib
+import dis
+import hashlib
+import inspect
+import logging
+import os
+import re
+import shutil
+import tempfile
+import types
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytket
+from pytket import Circuit
+
+from pytket_circuit_builder_api import __version__
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+    from_operation_list_func,
+)
+from pytket_circuit_builder_api.commands.commands import pytket_circbox
+from pytket_circuit_builder_api.commands.hashing import (
+    _STABLE_TYPES,
+    structural_digest,
+)
+from pytket_circuit_builder_api.commands.parallel import (
+    deserialize_circuit,
+    serialize_circuit,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+CACHE_VERSION = f"{__version__}-pytket{pytket.__version__}"
+# names of version directories, only these are removed when stale
+_VERSION_PATTERN = re.compile(r"[0-9][^-\s]*-pytket[0-9]\S*")
+_ENTRY_SUFFIX = ".circ"
+# opcodes reading a global (or, in class bodies, module level) name
+_GLOBAL_LOADS = frozenset({"LOAD_GLOBAL", "LOAD_NAME"})
+
+logger = logging.getLogger(__name__)
+
+
+class _UnkeyableValueError(Exception):
+    """A value used by a builder function has no stable cache key."""
+
+
+@dataclass(frozen=True)
+class DiskCacheStats:
+    """Snapshot of the statistics of a disk cache, for this process."""
+
+    hits: int
+    misses: int
+    evictions: int
+    n_entries: int
+    n_bytes: int
+    max_bytes: int
+
+
+class CircuitDiskCache:
+    """Persistent cache of built circuits on local disk.
+
+    Entries are keyed by a structural digest of a command list, or of the
+    source of a pytket_circbox function, and live in a directory named after
+    the library and pytket versions, so upgrading either invalidates them.
+    Entries are written atomically and eviction (least recently used first,
+    down to max_bytes) holds an exclusive file lock, so several processes can
+    share one cache directory. Stale version directories are removed, other
+    files and directories in the cache directory are left alone.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 256 * 2**20) -> None:
+        """Use (and create if needed) the cache at directory."""
+        self.root = Path(directory)
+        self.directory = self.root / CACHE_VERSION
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.root / ".lock"
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._remove_stale_versions()
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock_path.open("a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remove_stale_versions(self) -> None:
+        with self._locked():
+            for path in self.root.iterdir():
+                if (
+                    path.is_dir()
+                    and path != self.directory
+                    and _VERSION_PATTERN.fullmatch(path.name)
+                ):
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        stats = []
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            with contextlib.suppress(FileNotFoundError):
+                stats.append((path, path.stat()))
+        return stats
+
+    def get(self, key: str) -> Circuit | None:
+        """Return the cached circuit for key, or None."""
+        entry = self._entry(key)
+        try:
+            data = entry.read_bytes()
+        except FileNotFoundError:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # refresh the modification time, which orders entries for eviction
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry)
+        return deserialize_circuit(data)
+
+    def put(self, key: str, circuit: Circuit) -> None:
+        """Store a circuit under key, evicting old entries if over the size limit."""
+        data = serialize_circuit(circuit)
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        Path(temp_name).replace(self._entry(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._locked():
+            entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+            total = sum(stat.st_size for _, stat in entries)
+            for path, stat in entries:
+                if total <= self.max_bytes:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+                    self._evictions += 1
+                total -= stat.st_size
+
+    def get_or_build(self, key: str, build: Callable[[], Circuit]) -> Circuit:
+        """Return the cached circuit for key, building and storing it on a miss."""
+        circuit = self.get(key)
+        if circuit is None:
+            circuit = build()
+            self.put(key, circuit)
+        return circuit
+
+    def clear(self) -> None:
+        """Remove all entries of the current version."""
+        with self._locked():
+            for path, _ in self._entries():
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+
+    def stats(self) -> DiskCacheStats:
+        """Return the statistics of this process and the current cache size."""
+        entries = self._entries()
+        return DiskCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            n_entries=len(entries),
+            n_bytes=sum(stat.st_size for _, stat in entries),
+            max_bytes=self.max_bytes,
+        )
+
+    @staticmethod
+    def function_key(func: Callable[..., Any]) -> str:
+        """Return a key for a builder function and the values it depends on.
+
+        Besides the name and source of the function, the values of its
+        closure variables, defaults and referenced globals are hashed, so
+        functions made by one factory with different arguments get different
+        keys. Functions among those values are keyed the same way, classes,
+        modules and loggers by name. Other values must be commands or have a
+        repr which is stable across processes (numbers, strings, units,
+        angles, and containers of those), otherwise an exception is raised.
+        """
+        hasher = hashlib.sha256()
+        _hash_function(hasher, func, set())
+        return hasher.hexdigest()
+
+    def get_or_build_function(
+        self,
+        func: Callable[..., Any],
+        build: Callable[[], Circuit],
+    ) -> Circuit:
+        """Return the circuit built by a builder function, cached by function_key.
+
+        If no key can be derived from the function, the circuit is built
+        without the cache and a warning is logged.
+        """
+        try:
+            key = self.function_key(func)
+        except _UnkeyableValueError as error:
+            logger.warning("Building %s without the disk cache: %s", func, error)
+            return build()
+        return self.get_or_build(key, build)
+
+    def from_operation_list(self, commands: Iterable[TketCompatibleCommand]) -> Circuit:
+        """Cached version of Circuit.from_operation_list."""
+        commands = list(commands)
+        return self.get_or_build(
+            structural_digest(commands),
+            lambda: from_operation_list_func(commands),
+        )
+
+    def pytket_circbox(
+        self,
+        func: Callable[..., Iterable[TketCompatibleCommand]] | None = None,
+        *,
+        cache_size: int = 0,
+    ) -> Any:
+        """Version of the pytket_circbox decorator loading the body from the cache."""
+        return pytket_circbox(func, cache_size=cache_size, circuit_cache=self)
+
+
+def _global_names(code: types.CodeType) -> set[str]:
+    # co_names also holds attribute names, so look for the global loads
+    names = {
+        instruction.argval
+        for instruction in dis.get_instructions(code)
+        if instruction.opname in _GLOBAL_LOADS
+    }
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+    return names
+
+
+def _hash_function(hasher: Any, func: Callable[..., Any], seen: set[int]) -> None:
+    func = inspect.unwrap(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+    hasher.update(f"function {name}\n".encode())
+    if id(func) in seen:
+        return
+    seen.add(id(func))
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    hasher.update(source.encode())
+
+    for value in func.__defaults__ or ():
+        _hash_value(hasher, value, name, seen)
+    for key, value in sorted((func.__kwdefaults__ or {}).items()):
+        hasher.update(f"default {key}\n".encode())
+        _hash_value(hasher, value, name, seen)
+    for variable, cell in zip(func.__code__.co_freevars, func.__closure__ or ()):
+        hasher.update(f"closure {variable}\n".encode())
+        try:
+            value = cell.cell_contents
+        except ValueError:  # not assigned yet
+            continue
+        _hash_value(hasher, value, name, seen)
+    for variable in sorted(_global_names(func.__code__)):
+        if variable in func.__globals__:
+            hasher.update(f"global {variable}\n".encode())
+            _hash_value(hasher, func.__globals__[variable], name, seen)
+
+
+def _hash_value(hasher: Any, value: Any, owner: str, seen: set[int]) -> None:
+    if inspect.isfunction(value):
+        _hash_function(hasher, value, seen)
+    elif isinstance(value, type):
+        hasher.update(f"class {value.__module__}.{value.__qualname__}\n".encode())
+    elif isinstance(value, types.ModuleType):
+        hasher.update(f"module {value.__name__}\n".encode())
+    elif isinstance(value, logging.Logger):
+        hasher.update(f"logger {value.name}\n".encode())
+    elif isinstance(value, types.BuiltinFunctionType):
+        hasher.update(f"builtin {value.__module__}.{value.__qualname__}\n".encode())
+    elif isinstance(value, (tuple, list)):
+        hasher.update(f"{type(value).__name__} {len(value)}\n".encode())
+        for item in value:
+            _hash_value(hasher, item, owner, seen)
+    elif isinstance(value, dict):
+        hasher.update(f"dict {len(value)}\n".encode())
+        for key, item in value.items():
+            _hash_value(hasher, key, owner, seen)
+            _hash_value(hasher, item, owner, seen)
+    elif hasattr(value, "append_to_tket_circuit"):
+        hasher.update(f"command {structural_digest(value)}\n".encode())
+    elif isinstance(value, _STABLE_TYPES):
+        hasher.update(f"{value!r}\n".encode())
+    else:
+        raise _UnkeyableValueError(
+            f"Cannot derive a cache key from the {type(value).__name__} "
+            f"value used by {owner}",
+        )
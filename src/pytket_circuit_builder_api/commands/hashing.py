@@ -0,0 +1,120 @@
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from pytket import Bit, OpType, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import (
+    CircBox,
+    QControlled,
+    structural_key,
+)
+from pytket_circuit_builder_api.commands.conditional import Conditional
+
+# types whose repr is the same in every process (it contains no addresses)
+_STABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    type(None),
+    Qubit,
+    Bit,
+    QubitRegister,
+    BitRegister,
+    Angle,
+    OpType,
+)
+
+
+def _check_stable(key: Any) -> None:
+    # commands without a structural_key method are their own key
+    if isinstance(key, tuple):
+        for item in key:
+            _check_stable(item)
+    elif not isinstance(key, _STABLE_TYPES):
+        raise Exception(
+            f"{type(key).__name__} has no structural key, "
+            f"so it has no digest which is stable across processes",
+        )
+
+
+def structural_digest(commands: TketCompatibleCommand | Iterable[Any]) -> str:
+    """Return a hash of a command or command list which is stable across processes.
+
+    Unlike ``hash`` the digest does not depend on the interpreter's hash seed,
+    so it can be used to key caches shared between processes and runs.
+    Commands (also nested ones) without a structural_key method raise an
+    exception, their repr may contain object addresses.
+    """
+    if hasattr(commands, "append_to_tket_circuit"):
+        commands = [commands]
+    hasher = hashlib.sha256()
+    for command in commands:
+        key = structural_key(command)
+        _check_stable(key)
+        hasher.update(repr(key).encode())
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+class HashConsTable:
+    """Share one instance between structurally identical commands.
+
+    Interning a command returns the first interned command equal to it.
+    Nested commands are interned too, and CircBoxes wrapping identical
+    circuits share a single definition (inner circuit and tket box).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._commands: dict[Any, TketCompatibleCommand] = {}
+        self._definitions: dict[str, CircBox] = {}
+
+    def intern(self, command: TketCompatibleCommand) -> TketCompatibleCommand:
+        """Return the shared instance structurally equal to command."""
+        key = structural_key(command)
+        existing = self._commands.get(key)
+        if existing is not None:
+            return existing
+        command = self._intern_children(command)
+        self._commands[key] = command
+        return command
+
+    def intern_all(
+        self,
+        commands: Iterable[TketCompatibleCommand],
+    ) -> list[TketCompatibleCommand]:
+        """Intern every command of a list."""
+        return [self.intern(command) for command in commands]
+
+    def _intern_children(
+        self,
+        command: TketCompatibleCommand,
+    ) -> TketCompatibleCommand:
+        if isinstance(command, QControlled):
+            inner = self.intern(command.command)
+            if inner is not command.command:
+                return QControlled(inner, command.control_qubits, command.control_state)
+        elif isinstance(command, Conditional):
+            inner = self.intern(command.command)
+            if inner is not command.command:
+                return Conditional(inner, command.condition)
+        elif isinstance(command, CircBox):
+            digest = structural_key(command)[1]
+            definition = self._definitions.setdefault(digest, command)
+            if definition._circuit is not command._circuit:
+                return definition._with_operands(
+                    list(command.qubits()),
+                    list(command.bits()),
+                )
+        return command
+
+    def __len__(self) -> int:
+        return len(self._commands)
@@ -0,0 +1,161 @@
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+from pytket import OpType, Qubit
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.buffer import (
+    _GATE_SPECS,
+    _OPCODES,
+    CommandBuffer,
+)
+
+LayerParams = npt.ArrayLike | Angle | str | None
+
+
+def brickwork_pairs(width: int, depth: int) -> npt.NDArray[np.int32]:
+    """Return (n, n + 1) index pairs of a brickwork pattern.
+
+    Even layers act on pairs starting at even indices and odd layers on pairs
+    starting at odd indices, layer after layer.
+    """
+    even = np.arange(0, width - 1, 2, dtype=np.int32)
+    odd = np.arange(1, width - 1, 2, dtype=np.int32)
+    starts = np.tile(np.concatenate([even, odd]), depth // 2)
+    if depth % 2:
+        starts = np.concatenate([starts, even])
+    return np.stack([starts, starts + 1], axis=1)
+
+
+def ladder_pairs(
+    width: int,
+    n_layers: int = 1,
+    reverse: bool = False,
+) -> npt.NDArray[np.int32]:
+    """Return (n, n + 1) index pairs sweeping down (or up) the register."""
+    starts = np.arange(width - 1, dtype=np.int32)
+    if reverse:
+        starts = starts[::-1]
+    starts = np.tile(starts, n_layers)
+    return np.stack([starts, starts + 1], axis=1)
+
+
+def all_to_all_pairs(width: int, n_layers: int = 1) -> npt.NDArray[np.int32]:
+    """Return all (i, j) index pairs with i < j."""
+    first, second = np.triu_indices(width, k=1)
+    pairs = np.stack([first, second], axis=1).astype(np.int32)
+    return np.tile(pairs, (n_layers, 1))
+
+
+def pattern_indices(
+    pattern: npt.ArrayLike,
+    n_layers: int = 1,
+    shift: int = 0,
+    width: int | None = None,
+) -> npt.NDArray[np.int32]:
+    """Repeat a custom index pattern, shifting it by shift every layer.
+
+    Args:
+        pattern: Index pattern of one layer, of shape (n_gates, n_qubits).
+        n_layers: Number of times the pattern is repeated.
+        shift: Offset added to all indices for each subsequent layer.
+        width: Register width, shifted indices wrap around it when given.
+
+    Returns:
+        Indices of all layers, of shape (n_layers * n_gates, n_qubits).
+    """
+    layer = np.asarray(pattern, dtype=np.int64)
+    if layer.ndim == 1:
+        layer = layer.reshape(-1, 1)
+    offsets = np.arange(n_layers, dtype=np.int64) * shift
+    indices = layer[np.newaxis, :, :] + offsets[:, np.newaxis, np.newaxis]
+    if width is not None:
+        indices %= width
+    return indices.reshape(-1, layer.shape[1]).astype(np.int32)
+
+
+def _check_two_qubit(op_type: OpType) -> None:
+    opcode = _OPCODES.get(op_type)
+    if opcode is None:
+        raise Exception(f"Op type {op_type} cannot be stored in a CommandBuffer")
+    if _GATE_SPECS[opcode].n_qubits != 2:
+        raise Exception(f"Op type {op_type} is not a two qubit gate")
+
+
+def pattern_layers(
+    op_type: OpType,
+    qubits: Sequence[Qubit],
+    pattern: npt.ArrayLike,
+    n_layers: int = 1,
+    shift: int = 0,
+    params: LayerParams = None,
+    buffer: CommandBuffer | None = None,
+) -> CommandBuffer:
+    """Add layers following a custom index pattern to a command buffer.
+
+    The pattern indexes into qubits. If no buffer is given a new one is
+    created, and the buffer is returned so it can be added to a circuit with
+    add_command(buffer) or as an element of a command list, extend([buffer]).
+    """
+    if buffer is None:
+        buffer = CommandBuffer()
+    table_ids = np.array([buffer.qubit_id(qubit) for qubit in qubits], dtype=np.int32)
+    indices = pattern_indices(pattern, n_layers, shift, len(qubits) if shift else None)
+    buffer.add_gates(op_type, table_ids[indices], params)
+    return buffer
+
+
+def brickwork_layers(
+    op_type: OpType,
+    qubits: Sequence[Qubit],
+    depth: int,
+    params: LayerParams = None,
+    buffer: CommandBuffer | None = None,
+) -> CommandBuffer:
+    """Add depth brickwork layers of a two qubit gate to a command buffer."""
+    _check_two_qubit(op_type)
+    return pattern_layers(
+        op_type,
+        qubits,
+        brickwork_pairs(len(qubits), depth),
+        params=params,
+        buffer=buffer,
+    )
+
+
+def ladder_layers(
+    op_type: OpType,
+    qubits: Sequence[Qubit],
+    n_layers: int = 1,
+    reverse: bool = False,
+    params: LayerParams = None,
+    buffer: CommandBuffer | None = None,
+) -> CommandBuffer:
+    """Add ladder layers of a two qubit gate to a command buffer."""
+    _check_two_qubit(op_type)
+    return pattern_layers(
+        op_type,
+        qubits,
+        ladder_pairs(len(qubits), n_layers, reverse),
+        params=params,
+        buffer=buffer,
+    )
+
+
+def all_to_all_layers(
+    op_type: OpType,
+    qubits: Sequence[Qubit],
+    n_layers: int = 1,
+    params: LayerParams = None,
+    buffer: CommandBuffer | None = None,
+) -> CommandBuffer:
+    """Add layers of a two qubit gate on every pair of qubits to a command buffer."""
+    _check_two_qubit(op_type)
+    return pattern_layers(
+        op_type,
+        qubits,
+        all_to_all_pairs(len(qubits), n_layers),
+        params=params,
+        buffer=buffer,
+    )
@@ -0,0 +1,104 @@
+import json
+import zlib
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from pytket import Bit, Circuit, Qubit
+
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+    from_operation_stream_func,
+)
+from pytket_circuit_builder_api.commands.commands import CircBox
+from pytket_circuit_builder_api.operand_index import add_bits, add_qubits
+
+
+@dataclass(frozen=True)
+class Block:
+    """An independent block of a larger circuit.
+
+    The builder is either a function decorated with pytket_circbox, whose
+    body is inlined, or a function returning an iterable of commands. It is
+    called with operands. Both must be picklable (defined at module level)
+    to be built in a worker process. The optional unit map renames units of
+    the built block before it is joined.
+    """
+
+    builder: Callable[..., Iterable[TketCompatibleCommand]]
+    operands: Sequence[Qubit | Bit] = ()
+    unit_map: Mapping[Qubit | Bit, Qubit | Bit] = field(default_factory=dict)
+
+
+def _build_block_circuit(block: Block) -> Circuit:
+    command_template = getattr(block.builder, "command_template", None)
+    if command_template is not None:
+        template_command = command_template.template_command
+        if not isinstance(template_command, CircBox):
+            raise Exception("Only pytket_circbox definitions can be used as blocks")
+        placed = command_template.apply_to(*_split(block.operands))
+        circuit = template_command._circuit.copy()
+        circuit.rename_units(
+            {
+                **dict(zip(circuit.qubits, placed.qubits(), strict=True)),
+                **dict(zip(circuit.bits, placed.bits(), strict=True)),
+            },
+        )
+    else:
+        circuit = from_operation_stream_func(block.builder(*block.operands))
+    if block.unit_map:
+        circuit.rename_units({old: new for old, new in block.unit_map.items()})
+    return circuit
+
+
+def _split(operands: Sequence[Qubit | Bit]) -> tuple[list[Qubit], list[Bit]]:
+    qubits = [unit for unit in operands if isinstance(unit, Qubit)]
+    bits = [unit for unit in operands if isinstance(unit, Bit)]
+    return qubits, bits
+
+
+def serialize_circuit(circuit: Circuit) -> bytes:
+    """Serialize a circuit to compressed JSON."""
+    return zlib.compress(json.dumps(circuit.to_dict()).encode())
+
+
+def deserialize_circuit(data: bytes) -> Circuit:
+    """Inverse of serialize_circuit."""
+    return Circuit.from_dict(json.loads(zlib.decompress(data)))
+
+
+def _build_block_serialized(block: Block) -> bytes:
+    return serialize_circuit(_build_block_circuit(block))
+
+
+def stitch(circuits: Iterable[Circuit]) -> Circuit:
+    """Join circuits one after the other, merging units with the same id."""
+    result = Circuit()
+    for circuit in circuits:
+        add_qubits(result, circuit.qubits)
+        add_bits(result, circuit.bits)
+        result.append(circuit)
+    return result
+
+
+def build_parallel(
+    blocks: Sequence[Block],
+    processes: int | None = None,
+) -> Circuit:
+    """Build each block, in worker processes if requested, and join them in order.
+
+    Args:
+        blocks: Blocks to build, in the order they are joined.
+        processes: Number of worker processes, blocks are built in the current
+            process when this is None.
+
+    Returns:
+        The joined circuit.
+    """
+    if processes is None:
+        return stitch(_build_block_circuit(block) for block in blocks)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return stitch(
+            deserialize_circuit(data)
+            for data in executor.map(_build_block_serialized, blocks)
+        )
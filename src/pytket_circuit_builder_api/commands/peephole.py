@@ -0,0 +1,139 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from pytket import Qubit
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import CX, CRz, Rz
+
+
+@dataclass(frozen=True)
+class PeepholeStats:
+    """Counts of the gates seen and removed by a peephole optimizer."""
+
+    n_commands: int
+    n_merged: int
+    n_cancelled: int
+    n_dropped: int
+
+    @property
+    def n_removed(self) -> int:
+        """Total number of commands removed."""
+        return self.n_merged + self.n_cancelled + self.n_dropped
+
+
+def _is_identity(angle: Angle) -> bool:
+    # Rz(4) is the identity, Rz(2) only up to a (for CRz, relative) phase
+    value = angle.value
+    return value is not None and value % 4 == 0
+
+
+class PeepholeOptimizer:
+    """Streaming removal of redundant gates from a command stream.
+
+    Adjacent Rz gates on the same qubit are merged, back to back identical
+    CX gates cancel and Rz and CRz gates with a zero angle are dropped. The
+    last gate on each qubit is tracked, so gates only interact when no other
+    command acts on their qubits in between. Any other command (including
+    Conditional and QControlled commands, whatever they wrap) is a boundary
+    which is passed through unchanged.
+
+    Up to window commands are held back at a time, so the stream is
+    processed in constant memory. One optimizer can be used for several
+    streams, its statistics accumulate.
+    """
+
+    def __init__(self, window: int = 256) -> None:
+        """Initialize an optimizer holding back at most window commands."""
+        if window < 1:
+            raise Exception("Window must be positive")
+        self.window = window
+        self._n_commands = 0
+        self._n_merged = 0
+        self._n_cancelled = 0
+        self._n_dropped = 0
+
+    def stats(self) -> PeepholeStats:
+        """Return the statistics of all streams optimized so far."""
+        return PeepholeStats(
+            n_commands=self._n_commands,
+            n_merged=self._n_merged,
+            n_cancelled=self._n_cancelled,
+            n_dropped=self._n_dropped,
+        )
+
+    def optimize(
+        self,
+        commands: Iterable[TketCompatibleCommand],
+    ) -> Iterator[TketCompatibleCommand]:
+        """Yield the commands of a stream with redundant gates removed."""
+        # pending commands by position, and per qubit the positions of the
+        # pending commands acting on it, the last one at the end
+        pending: dict[int, TketCompatibleCommand] = {}
+        on_qubit: dict[Qubit, deque[int]] = {}
+
+        def last(qubit: Qubit) -> int | None:
+            positions = on_qubit.get(qubit)
+            return positions[-1] if positions else None
+
+        def remove_last(position: int) -> None:
+            for qubit in pending.pop(position).qubits():
+                on_qubit[qubit].pop()
+
+        def emit_first() -> TketCompatibleCommand:
+            position = next(iter(pending))
+            command = pending.pop(position)
+            for qubit in command.qubits():
+                on_qubit[qubit].popleft()
+            return command
+
+        for position, command in enumerate(commands):
+            self._n_commands += 1
+            if type(command) is Rz or type(command) is CRz:
+                if _is_identity(command.angle):
+                    self._n_dropped += 1
+                    continue
+            if type(command) is Rz:
+                previous = last(command.qubit)
+                merged = None if previous is None else pending[previous]
+                if previous is not None and type(merged) is Rz:
+                    self._n_merged += 1
+                    angle = _add_angles(merged.angle, command.angle)
+                    if _is_identity(angle):
+                        self._n_dropped += 1
+                        remove_last(previous)
+                    else:
+                        pending[previous] = Rz(angle, command.qubit)
+                    continue
+            elif type(command) is CX:
+                previous = last(command.target)
+                if (
+                    previous is not None
+                    and previous == last(command.control)
+                    and pending[previous] == command
+                ):
+                    self._n_cancelled += 2
+                    remove_last(previous)
+                    continue
+
+            pending[position] = command
+            for qubit in command.qubits():
+                positions = on_qubit.get(qubit)
+                if positions is None:
+                    positions = on_qubit[qubit] = deque()
+                positions.append(position)
+            if len(pending) > self.window:
+                yield emit_first()
+
+        while pending:
+            yield emit_first()
+
+
+def _add_angles(first: Angle, second: Angle) -> Angle:
+    if first.value is not None and second.value is not None:
+        return Angle(first.value + second.value)
+    return Angle(first.expr + second.expr)
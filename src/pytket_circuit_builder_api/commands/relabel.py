@@ -0,0 +1,173 @@
+from collections.abc import Callable, Iterable
+from typing import Any, overload
+
+from pytket import Bit, Qubit
+
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+)
+from pytket_circuit_builder_api.commands.conditional import Conditional
+
+
+class _Relabeler:
+    """Applies one qubit and bit map to many commands.
+
+    Commands whose operands are unchanged are returned as they are, and each
+    composite command object is relabelled once, so shared subtrees stay
+    shared.
+    """
+
+    def __init__(self, qubit_map: dict[Qubit, Qubit], bit_map: dict[Bit, Bit]) -> None:
+        self.qubit_map = qubit_map
+        self.bit_map = bit_map
+        self.done: dict[int, tuple[Any, Any]] = {}
+        get = qubit_map.get
+
+        def cx(command: CX) -> CX:
+            target, control = command.target, command.control
+            new_target, new_control = get(target, target), get(control, control)
+            if new_target is target and new_control is control:
+                return command
+            return CX(new_target, new_control)
+
+        def rz(command: Rz) -> Rz:
+            qubit = command.qubit
+            new_qubit = get(qubit, qubit)
+            if new_qubit is qubit:
+                return command
+            return Rz(command.angle, new_qubit)
+
+        def crz(command: CRz) -> CRz:
+            target, control = command.target, command.control
+            new_target, new_control = get(target, target), get(control, control)
+            if new_target is target and new_control is control:
+                return command
+            return CRz(command.angle, new_target, new_control)
+
+        self.handlers: dict[type, Callable[[Any], Any]] = {
+            CX: cx,
+            Rz: rz,
+            CRz: crz,
+            QControlled: self._shared(self._qcontrolled),
+            CircBox: self._shared(self._circbox),
+            Conditional: self._shared(self._conditional),
+        }
+
+    def relabel(self, command: TketCompatibleCommand) -> TketCompatibleCommand:
+        handler = self.handlers.get(type(command))
+        if handler is None:
+            return command.sub(self.qubit_map, self.bit_map)
+        return handler(command)
+
+    def relabel_all(
+        self,
+        commands: Iterable[TketCompatibleCommand],
+    ) -> list[TketCompatibleCommand]:
+        handlers = self.handlers
+        relabelled = []
+        for command in commands:
+            handler = handlers.get(type(command))
+            if handler is None:
+                relabelled.append(command.sub(self.qubit_map, self.bit_map))
+            else:
+                relabelled.append(handler(command))
+        return relabelled
+
+    def _shared(self, handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        done = self.done
+
+        def relabel_once(command: Any) -> Any:
+            entry = done.get(id(command))
+            if entry is not None:
+                return entry[1]
+            new_command = handler(command)
+            # keep the original alive so that its id is not reused
+            done[id(command)] = (command, new_command)
+            return new_command
+
+        return relabel_once
+
+    def _unchanged(self, new: Iterable[Any], old: Iterable[Any]) -> bool:
+        return all(n is o for n, o in zip(new, old))
+
+    def _qcontrolled(self, command: QControlled) -> QControlled:
+        inner = self.relabel(command.command)
+        controls = tuple(self.qubit_map.get(q, q) for q in command.control_qubits)
+        if inner is command.command and self._unchanged(
+            controls,
+            command.control_qubits,
+        ):
+            return command
+        return QControlled(inner, controls, command.control_state)
+
+    def _circbox(self, command: CircBox) -> CircBox:
+        qubits = [self.qubit_map.get(q, q) for q in command._qubits]
+        bits = [self.bit_map.get(b, b) for b in command._bits]
+        if self._unchanged(qubits, command._qubits) and self._unchanged(
+            bits,
+            command._bits,
+        ):
+            return command
+        # the inner circuit and tket box are shared
+        return command._with_operands(qubits, bits)
+
+    def _conditional(self, command: Conditional) -> Conditional:
+        inner = self.relabel(command.command)
+        condition = command.condition.sub(self.bit_map)
+        if inner is command.command and condition is command.condition:
+            return command
+        return Conditional(inner, condition)
+
+
+@overload
+def relabel(
+    target: CommandBuffer,
+    qubit_map: dict[Qubit, Qubit] | None = None,
+    bit_map: dict[Bit, Bit] | None = None,
+) -> CommandBuffer: ...
+
+
+@overload
+def relabel(
+    target: TketCompatibleCommand,
+    qubit_map: dict[Qubit, Qubit] | None = None,
+    bit_map: dict[Bit, Bit] | None = None,
+) -> TketCompatibleCommand: ...
+
+
+@overload
+def relabel(
+    target: Iterable[TketCompatibleCommand],
+    qubit_map: dict[Qubit, Qubit] | None = None,
+    bit_map: dict[Bit, Bit] | None = None,
+) -> list[TketCompatibleCommand]: ...
+
+
+def relabel(
+    target: CommandBuffer | TketCompatibleCommand | Iterable[TketCompatibleCommand],
+    qubit_map: dict[Qubit, Qubit] | None = None,
+    bit_map: dict[Bit, Bit] | None = None,
+) -> CommandBuffer | TketCompatibleCommand | list[TketCompatibleCommand]:
+    """Rename the qubits and bits of a command buffer, a command or a command list.
+
+    The maps are applied to the whole target in one pass, equivalent to
+    calling sub on every command. Unchanged commands are shared with the
+    input, as are CircBox definitions, and a composite command object
+    appearing several times is relabelled once.
+    """
+    qubit_map = qubit_map or {}
+    bit_map = bit_map or {}
+    if isinstance(target, CommandBuffer):
+        return target.relabel(qubit_map)
+    relabeler = _Relabeler(qubit_map, bit_map)
+    if isinstance(target, Iterable):
+        return relabeler.relabel_all(target)
+    return relabeler.relabel(target)
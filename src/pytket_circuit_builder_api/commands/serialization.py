@@ -0,0 +1,373 @@
+import json
+import mmap
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, overload
+
+from pytket import Bit, Circuit, Qubit
+
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+)
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+)
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+
+MAGIC = b"PTCB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQQQQ")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_TAG_CX = 0
+_TAG_RZ = 1
+_TAG_CRZ = 2
+_TAG_QCONTROLLED = 3
+_TAG_CIRCBOX = 4
+_TAG_CONDITIONAL = 5
+
+_ANGLE_FLOAT = 0
+_ANGLE_SYMBOLIC = 1
+
+_UNIT_QUBIT = 0
+_UNIT_BIT = 1
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        self.units: list[Qubit | Bit] = []
+        self.unit_ids: dict[tuple[int, Qubit | Bit], int] = {}
+        self.boxes: list[Circuit] = []
+        self.box_ids: dict[int, int] = {}
+
+    def string_id(self, string: str) -> int:
+        index = self.string_ids.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(string)
+            self.string_ids[string] = index
+        return index
+
+    def unit_id(self, unit: Qubit | Bit) -> int:
+        # Qubit and Bit compare equal for equal names, so key on the kind too
+        key = (_UNIT_BIT if isinstance(unit, Bit) else _UNIT_QUBIT, unit)
+        index = self.unit_ids.get(key)
+        if index is None:
+            index = len(self.units)
+            self.units.append(unit)
+            self.unit_ids[key] = index
+            self.string_id(unit.reg_name)
+        return index
+
+    def box_id(self, box: CircBox) -> int:
+        index = self.box_ids.get(id(box._circuit))
+        if index is None:
+            index = len(self.boxes)
+            self.boxes.append(box._circuit)
+            self.box_ids[id(box._circuit)] = index
+        return index
+
+    def units_bytes(self, units: Sequence[Qubit | Bit]) -> bytes:
+        return _U32.pack(len(units)) + b"".join(
+            _U32.pack(self.unit_id(unit)) for unit in units
+        )
+
+    def angle_bytes(self, angle: Angle) -> bytes:
+        if angle.is_symbolic():
+            return _U8.pack(_ANGLE_SYMBOLIC) + _U32.pack(
+                self.string_id(str(angle.expr)),
+            )
+        return _U8.pack(_ANGLE_FLOAT) + _F64.pack(angle.value)
+
+    def encode(self, command: TketCompatibleCommand) -> bytes:
+        if isinstance(command, CX):
+            return _U8.pack(_TAG_CX) + self.units_bytes(
+                [command.target, command.control]
+            )
+        if isinstance(command, Rz):
+            return (
+                _U8.pack(_TAG_RZ)
+                + self.angle_bytes(command.angle)
+                + self.units_bytes([command.qubit])
+            )
+        if isinstance(command, CRz):
+            return (
+                _U8.pack(_TAG_CRZ)
+                + self.angle_bytes(command.angle)
+                + self.units_bytes([command.target, command.control])
+            )
+        if isinstance(command, QControlled):
+            return (
+                _U8.pack(_TAG_QCONTROLLED)
+                + self.units_bytes(command.control_qubits)
+                + bytes(bool(state) for state in command.control_state)
+                + self.encode(command.command)
+            )
+        if isinstance(command, CircBox):
+            return (
+                _U8.pack(_TAG_CIRCBOX)
+                + _U32.pack(self.box_id(command))
+                + self.units_bytes(command.qubits())
+                + self.units_bytes(command.bits())
+            )
+        if isinstance(command, Conditional) and isinstance(
+            command.condition,
+            QasmCondition,
+        ):
+            return (
+                _U8.pack(_TAG_CONDITIONAL)
+                + self.units_bytes(command.condition.bits)
+                + _I64.pack(command.condition.value)
+                + self.encode(command.command)
+            )
+        raise Exception(f"Command {command} cannot be serialized")
+
+
+def _string_bytes(string: str) -> bytes:
+    encoded = string.encode()
+    return _U32.pack(len(encoded)) + encoded
+
+
+def _write(file: BinaryIO, data: bytes) -> int:
+    file.write(data)
+    return len(data)
+
+
+def dump_commands(
+    commands: Iterable[TketCompatibleCommand],
+    path: str | Path,
+) -> None:
+    """Write commands to a file in the compact binary format.
+
+    The file holds a fixed header, the encoded commands, a table of command
+    offsets, a string table, a unit table and the CircBox definitions. Units
+    and symbolic angles are stored once in the tables and referenced by
+    index, and each CircBox definition is stored once, as tket JSON.
+    """
+    encoder = _Encoder()
+    offsets: list[int] = []
+    with Path(path).open("wb") as file:
+        position = _write(file, b"\0" * _HEADER.size)
+        for command in commands:
+            offsets.append(position)
+            position += _write(file, encoder.encode(command))
+
+        offsets_position = position
+        position += _write(file, b"".join(_U64.pack(offset) for offset in offsets))
+
+        strings_position = position
+        position += _write(file, _U32.pack(len(encoder.strings)))
+        for string in encoder.strings:
+            position += _write(file, _string_bytes(string))
+
+        units_position = position
+        position += _write(file, _U32.pack(len(encoder.units)))
+        for unit in encoder.units:
+            kind = _UNIT_BIT if isinstance(unit, Bit) else _UNIT_QUBIT
+            position += _write(
+                file,
+                _U8.pack(kind)
+                + _U32.pack(encoder.string_id(unit.reg_name))
+                + _U32.pack(len(unit.index))
+                + b"".join(_U32.pack(i) for i in unit.index),
+            )
+
+        boxes_position = position
+        position += _write(file, _U32.pack(len(encoder.boxes)))
+        for circuit in encoder.boxes:
+            position += _write(file, _string_bytes(json.dumps(circuit.to_dict())))
+
+        file.seek(0)
+        file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                len(offsets),
+                offsets_position,
+                strings_position,
+                units_position,
+                boxes_position,
+            ),
+        )
+
+
+class CommandFile(Sequence[TketCompatibleCommand]):
+    """Lazily decoded, memory mapped command list written by dump_commands.
+
+    Only the string and unit tables are decoded when the file is opened.
+    Commands are decoded on access and CircBox definitions the first time
+    they are referenced.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Map the file at path into memory and read its tables."""
+        self._file = Path(path).open("rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            self._read_tables(path)
+        except BaseException:
+            # invalid or truncated files must not leak the handle and mapping
+            self.close()
+            raise
+
+    def _read_tables(self, path: str | Path) -> None:
+        (
+            magic,
+            version,
+            _,
+            self._n_commands,
+            self._offsets_position,
+            strings_position,
+            units_position,
+            boxes_position,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise Exception(f"{path} is not a command file")
+        if version != VERSION:
+            raise Exception(f"Unsupported command file version {version}")
+
+        buffer = self._mmap
+        n_strings = _U32.unpack_from(buffer, strings_position)[0]
+        position = strings_position + 4
+        self._strings: list[str] = []
+        for _ in range(n_strings):
+            string, position = self._read_string(position)
+            self._strings.append(string)
+
+        n_units = _U32.unpack_from(buffer, units_position)[0]
+        position = units_position + 4
+        self._units: list[Qubit | Bit] = []
+        for _ in range(n_units):
+            kind = _U8.unpack_from(buffer, position)[0]
+            name = self._strings[_U32.unpack_from(buffer, position + 1)[0]]
+            n_index = _U32.unpack_from(buffer, position + 5)[0]
+            index = list(struct.unpack_from(f"<{n_index}I", buffer, position + 9))
+            position += 9 + 4 * n_index
+            unit_type = Bit if kind == _UNIT_BIT else Qubit
+            self._units.append(unit_type(name, index))
+
+        n_boxes = _U32.unpack_from(buffer, boxes_position)[0]
+        position = boxes_position + 4
+        self._box_positions: list[int] = []
+        for _ in range(n_boxes):
+            self._box_positions.append(position)
+            position += 4 + _U32.unpack_from(buffer, position)[0]
+        self._boxes: dict[int, CircBox] = {}
+
+    def _read_string(self, position: int) -> tuple[str, int]:
+        length = _U32.unpack_from(self._mmap, position)[0]
+        start = position + 4
+        return self._mmap[start : start + length].decode(), start + length
+
+    def _read_units(self, position: int) -> tuple[list[Any], int]:
+        n_units = _U32.unpack_from(self._mmap, position)[0]
+        ids = struct.unpack_from(f"<{n_units}I", self._mmap, position + 4)
+        return [self._units[i] for i in ids], position + 4 + 4 * n_units
+
+    def _read_angle(self, position: int) -> tuple[Angle, int]:
+        kind = _U8.unpack_from(self._mmap, position)[0]
+        if kind == _ANGLE_FLOAT:
+            return Angle(_F64.unpack_from(self._mmap, position + 1)[0]), position + 9
+        string = self._strings[_U32.unpack_from(self._mmap, position + 1)[0]]
+        return Angle(string), position + 5
+
+    def _box(self, box_id: int) -> CircBox:
+        box = self._boxes.get(box_id)
+        if box is None:
+            circuit_json, _ = self._read_string(self._box_positions[box_id])
+            box = CircBox(Circuit.from_dict(json.loads(circuit_json)))
+            self._boxes[box_id] = box
+        return box
+
+    def _decode(
+        self,
+        position: int,
+    ) -> tuple[TketCompatibleCommand, int]:
+        tag = _U8.unpack_from(self._mmap, position)[0]
+        position += 1
+        if tag == _TAG_CX:
+            (target, control), position = self._read_units(position)
+            return CX(target, control), position
+        if tag == _TAG_RZ:
+            angle, position = self._read_angle(position)
+            (qubit,), position = self._read_units(position)
+            return Rz(angle, qubit), position
+        if tag == _TAG_CRZ:
+            angle, position = self._read_angle(position)
+            (target, control), position = self._read_units(position)
+            return CRz(angle, target, control), position
+        if tag == _TAG_QCONTROLLED:
+            controls, position = self._read_units(position)
+            state = [bool(b) for b in self._mmap[position : position + len(controls)]]
+            command, position = self._decode(position + len(controls))
+            return QControlled(command, controls, state), position
+        if tag == _TAG_CIRCBOX:
+            box = self._box(_U32.unpack_from(self._mmap, position)[0])
+            qubits, position = self._read_units(position + 4)
+            bits, position = self._read_units(position)
+            return box._with_operands(qubits, bits), position
+        if tag == _TAG_CONDITIONAL:
+            bits, position = self._read_units(position)
+            value = _I64.unpack_from(self._mmap, position)[0]
+            command, position = self._decode(position + 8)
+            return Conditional(command, QasmCondition(bits, value)), position
+        raise Exception(f"Unknown command tag {tag}")
+
+    def __len__(self) -> int:
+        return self._n_commands
+
+    @overload
+    def __getitem__(self, index: int) -> TketCompatibleCommand: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TketCompatibleCommand]: ...
+
+    def __getitem__(
+        self,
+        index: int | slice,
+    ) -> TketCompatibleCommand | list[TketCompatibleCommand]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n_commands))]
+        position = index + self._n_commands if index < 0 else index
+        if not 0 <= position < self._n_commands:
+            raise IndexError("Command index out of range")
+        offset = _U64.unpack_from(self._mmap, self._offsets_position + 8 * position)[0]
+        return self._decode(offset)[0]
+
+    def __iter__(self) -> Iterator[TketCompatibleCommand]:
+        for index in range(self._n_commands):
+            yield self[index]
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "CommandFile":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def load_commands(path: str | Path) -> CommandFile:
+    """Open a command file written by dump_commands for lazy reading."""
+    return CommandFile(path)
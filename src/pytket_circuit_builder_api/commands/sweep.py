@@ -0,0 +1,179 @@
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import sympy
+from pytket import Circuit
+
+from pytket_circuit_builder_api.commands.command_interface import (
+    TketCompatibleCommand,
+    from_operation_list_func,
+)
+from pytket_circuit_builder_api.commands.commands import CircBox
+
+ParameterValues = Sequence[float] | Mapping[str | sympy.Symbol, float]
+
+_worker_circuit: Circuit | None = None
+_worker_symbols: tuple[sympy.Symbol, ...] = ()
+
+
+def _symbolic_circuit(
+    source: Iterable[TketCompatibleCommand] | Callable[..., Any],
+) -> Circuit:
+    command_template = getattr(source, "command_template", None)
+    if command_template is not None:
+        template_command = command_template.template_command
+        if not isinstance(template_command, CircBox):
+            raise Exception("Only pytket_circbox definitions can be swept")
+        return template_command._circuit.copy()
+    if callable(source):
+        raise Exception("Only pytket_circbox definitions can be swept")
+    return from_operation_list_func(source)
+
+
+def _substitution(
+    symbols: Sequence[sympy.Symbol],
+    values: ParameterValues,
+) -> dict[sympy.Symbol, float]:
+    if isinstance(values, Mapping):
+        by_symbol = {sympy.Symbol(str(name)): value for name, value in values.items()}
+        missing = [symbol for symbol in symbols if symbol not in by_symbol]
+        if missing:
+            raise Exception(f"No values given for symbols {missing}")
+        return {symbol: by_symbol[symbol] for symbol in symbols}
+    if len(values) != len(symbols):
+        raise Exception(
+            f"Expected {len(symbols)} parameter values, got {len(values)}",
+        )
+    return dict(zip(symbols, values, strict=True))
+
+
+def _bind(
+    circuit: Circuit,
+    symbols: Sequence[sympy.Symbol],
+    values: ParameterValues,
+) -> Circuit:
+    bound = circuit.copy()
+    substitution = _substitution(symbols, values)
+    if substitution:
+        bound.symbol_substitution(substitution)
+    return bound
+
+
+def _init_worker(circuit_dict: dict[str, Any], symbol_names: Sequence[str]) -> None:
+    global _worker_circuit, _worker_symbols
+    _worker_circuit = Circuit.from_dict(circuit_dict)
+    _worker_symbols = tuple(sympy.Symbol(name) for name in symbol_names)
+
+
+def _bind_in_worker(values: ParameterValues) -> dict[str, Any]:
+    assert _worker_circuit is not None
+    return _bind(_worker_circuit, _worker_symbols, values).to_dict()
+
+
+class ParameterSweep:
+    """Build a symbolic circuit once and bind it to many parameter sets.
+
+    The source is either a list of commands or a function decorated with
+    pytket_circbox. Parameter vectors are matched to ``symbols`` by position,
+    which defaults to the free symbols of the circuit sorted by name.
+
+    Each parameter set is bound by copying the circuit and substituting the
+    symbols it uses, both done by tket. Rebuilding only the commands which
+    depend on the symbols would go through Python for every command, which
+    is slower.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[TketCompatibleCommand] | Callable[..., Any],
+        symbols: Sequence[str | sympy.Symbol] | None = None,
+    ) -> None:
+        """Build the symbolic circuit."""
+        self._circuit = _symbolic_circuit(source)
+        self._free_symbols = frozenset(self._circuit.free_symbols())
+
+        if symbols is None:
+            self._symbols = tuple(sorted(self._free_symbols, key=str))
+        else:
+            self._symbols = tuple(sympy.Symbol(str(symbol)) for symbol in symbols)
+            unknown = sorted(self._free_symbols - set(self._symbols), key=str)
+            if unknown:
+                raise Exception(f"Circuit depends on unlisted symbols {unknown}")
+
+    @property
+    def circuit(self) -> Circuit:
+        """Return a copy of the symbolic circuit."""
+        return self._circuit.copy()
+
+    @property
+    def symbols(self) -> tuple[sympy.Symbol, ...]:
+        """The symbols parameter vectors are matched against, in order."""
+        return self._symbols
+
+    def _used_symbols(self) -> tuple[sympy.Symbol, ...]:
+        return tuple(symbol for symbol in self._symbols if symbol in self._free_symbols)
+
+    def _used_values(self, values: ParameterValues) -> ParameterValues:
+        if isinstance(values, Mapping):
+            return values
+        if len(values) != len(self._symbols):
+            raise Exception(
+                f"Expected {len(self._symbols)} parameter values, got {len(values)}",
+            )
+        return [
+            value
+            for symbol, value in zip(self._symbols, values, strict=True)
+            if symbol in self._free_symbols
+        ]
+
+    def bind(self, values: ParameterValues) -> Circuit:
+        """Return the circuit with its symbols replaced by values."""
+        return _bind(self._circuit, self._used_symbols(), self._used_values(values))
+
+    def stream(
+        self,
+        batch: Iterable[ParameterValues],
+        processes: int | None = None,
+        chunksize: int = 16,
+    ) -> Iterator[Circuit]:
+        """Yield bound circuits for each parameter set, in input order.
+
+        Args:
+            batch: Parameter sets, as vectors or mappings from symbol names.
+            processes: Number of worker processes, circuits are bound in the
+                current process when this is None.
+            chunksize: Number of parameter sets sent to a worker at a time.
+
+        Yields:
+            The bound circuit of each parameter set.
+        """
+        used_values = (self._used_values(values) for values in batch)
+        if processes is None:
+            symbols = self._used_symbols()
+            for values in used_values:
+                yield _bind(self._circuit, symbols, values)
+            return
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(
+                self._circuit.to_dict(),
+                [str(symbol) for symbol in self._used_symbols()],
+            ),
+        ) as executor:
+            for circuit_dict in executor.map(
+                _bind_in_worker,
+                used_values,
+                chunksize=chunksize,
+            ):
+                yield Circuit.from_dict(circuit_dict)
+
+    def run(
+        self,
+        batch: Iterable[ParameterValues],
+        processes: int | None = None,
+        chunksize: int = 16,
+    ) -> list[Circuit]:
+        """Return bound circuits for each parameter set, in input order."""
+        return list(self.stream(batch, processes, chunksize))
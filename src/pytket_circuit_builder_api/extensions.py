@@ -0,0 +1,28 @@
+import os
+
+AUTO_INSTALL_VARIABLE = "PYTKET_CIRCUIT_BUILDER_AUTO_INSTALL"
+
+
+def auto_install_enabled() -> bool:
+    """Return whether Circuit extensions are installed when their module is imported.
+
+    By default importing has no side effects and install must be called
+    explicitly, set the environment variable
+    PYTKET_CIRCUIT_BUILDER_AUTO_INSTALL to 1 to install on import instead.
+    """
+    return os.environ.get(AUTO_INSTALL_VARIABLE, "0") == "1"
+
+
+def install() -> None:
+    """Add the methods of the commands and operators APIs to pytket Circuit.
+
+    These are add_command, extend, from_operation_list,
+    from_operation_stream and from_command_buffer for the commands API, and
+    the same methods with a 2 suffix for the operators API.
+    """
+    from pytket_circuit_builder_api.commands import buffer, command_interface
+    from pytket_circuit_builder_api.operators import command
+
+    command_interface.install()
+    buffer.install()
+    command.install()
@@ -0,0 +1,199 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pytket_circuit_builder_api import boxes
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands import commands
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.conditional import Conditional
+from pytket_circuit_builder_api.operators import operators
+from pytket_circuit_builder_api.operators.command import OpCommand
+
+_COMMAND_CLASSES = [
+    commands.CX,
+    commands.Rz,
+    commands.CRz,
+    commands.QControlled,
+    commands.CircBox,
+    Conditional,
+]
+
+_active: "Profiler | None" = None
+_patches: list[tuple[Any, str, Any]] = []
+
+
+@dataclass(frozen=True)
+class CallStats:
+    """Number of calls and total time (including nested calls) of one entry."""
+
+    category: str
+    name: str
+    calls: int
+    seconds: float
+
+
+class Profiler:
+    """Collects call counts and times of the instrumented builder functions.
+
+    Categories are ``append`` (lowering a command into a circuit, per
+    command type), ``sub`` (per command type), ``template`` (instantiating
+    a pytket_operator or pytket_circbox, per definition), ``box`` (building
+    tket CircBoxes and QControlBoxes) and ``angle``. Times include nested
+    instrumented calls, such as lowering the commands inside a box.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        """Initialize empty statistics, also recording trace events if trace."""
+        self.trace = trace
+        self._stats: dict[tuple[str, str], list[int]] = {}
+        self._events: list[tuple[str, str, int, int, int]] = []
+        self._origin = time.perf_counter_ns()
+
+    def record(self, category: str, name: str, start: int, end: int) -> None:
+        """Record a call of name which ran from start to end (perf_counter_ns)."""
+        entry = self._stats.get((category, name))
+        if entry is None:
+            entry = self._stats[(category, name)] = [0, 0]
+        entry[0] += 1
+        entry[1] += end - start
+        if self.trace:
+            self._events.append((category, name, start, end, threading.get_ident()))
+
+    def report(self) -> list[CallStats]:
+        """Return the statistics of every entry, most time consuming first."""
+        return sorted(
+            (
+                CallStats(category, name, calls, elapsed / 1e9)
+                for (category, name), (calls, elapsed) in self._stats.items()
+            ),
+            key=lambda stats: stats.seconds,
+            reverse=True,
+        )
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        """Write the recorded calls as a Chrome trace (chrome://tracing, Perfetto)."""
+        if not self.trace:
+            raise Exception("Trace events are only recorded by Profiler(trace=True)")
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1e3,
+                "dur": (end - start) / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            for category, name, start, end, tid in self._events
+        ]
+        with Path(path).open("w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def _timed(
+    profiler: Profiler,
+    category: str,
+    name_of: Callable[[Sequence[Any]], str],
+    func: Callable[..., Any],
+) -> Callable[..., Any]:
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.record(category, name_of(args), start, perf_counter_ns())
+
+    return wrapper
+
+
+def _patch(
+    owner: Any,
+    attribute: str,
+    profiler: Profiler,
+    category: str,
+    name_of: Callable[[Sequence[Any]], str],
+) -> None:
+    original = getattr(owner, attribute)
+    _patches.append((owner, attribute, original))
+    setattr(owner, attribute, _timed(profiler, category, name_of, original))
+
+
+def _command_name(args: Sequence[Any]) -> str:
+    return type(args[0]).__name__
+
+
+def _op_command_name(args: Sequence[Any]) -> str:
+    return f"OpCommand({type(args[0].operator).__name__})"
+
+
+def _template_name(args: Sequence[Any]) -> str:
+    return args[0].name
+
+
+def enable(trace: bool = False) -> Profiler:
+    """Start instrumenting the builder and return the collecting profiler.
+
+    Instrumentation works by wrapping the hot functions, so it has no cost
+    while disabled.
+    """
+    global _active
+    if _active is not None:
+        raise Exception("Instrumentation is already enabled")
+    profiler = Profiler(trace=trace)
+    for command_class in _COMMAND_CLASSES:
+        _patch(
+            command_class,
+            "append_to_tket_circuit",
+            profiler,
+            "append",
+            _command_name,
+        )
+        _patch(command_class, "sub", profiler, "sub", _command_name)
+    _patch(
+        CommandBuffer,
+        "append_to_tket_circuit",
+        profiler,
+        "append",
+        _command_name,
+    )
+    _patch(OpCommand, "append_to_tket_circuit", profiler, "append", _op_command_name)
+    for method in ("apply_to", "apply_in_order"):
+        _patch(commands.CommandTemplate, method, profiler, "template", _template_name)
+    _patch(operators.CommandTemplate, "apply_to", profiler, "template", _template_name)
+    _patch(boxes, "TketCircBox", profiler, "box", lambda args: "CircBox")
+    _patch(boxes, "QControlBox", profiler, "box", lambda args: "QControlBox")
+    _patch(Angle, "__init__", profiler, "angle", lambda args: "Angle")
+    _active = profiler
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """Stop instrumenting the builder and return the profiler that was active."""
+    global _active
+    while _patches:
+        owner, attribute, original = _patches.pop()
+        setattr(owner, attribute, original)
+    profiler, _active = _active, None
+    return profiler
+
+
+@contextlib.contextmanager
+def profile(trace: bool = False) -> Iterator[Profiler]:
+    """Instrument the builder for the duration of a with block."""
+    profiler = enable(trace=trace)
+    try:
+        yield profiler
+    finally:
+        disable()
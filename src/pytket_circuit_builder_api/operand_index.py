@@ -0,0 +1,79 @@
+from collections.abc import Iterable
+
+from pytket import Bit, Circuit, Qubit
+
+_INDEX_ATTR = "_builder_operand_index"
+
+
+class _OperandIndex:
+    # the units of a circuit, the number of units the circuit had when they
+    # were last compared, and the lookups left before comparing them again
+    __slots__ = ("units", "n_units", "lookups_left")
+
+    def __init__(self, circuit: Circuit) -> None:
+        self.units: set[Qubit | Bit] = set(circuit.qubits)
+        self.units.update(circuit.bits)
+        self.n_units = circuit.n_qubits + circuit.n_bits
+        self.lookups_left = self.n_units
+
+
+def _rebuild_operand_index(circuit: Circuit) -> _OperandIndex:
+    index = _OperandIndex(circuit)
+    setattr(circuit, _INDEX_ATTR, index)
+    return index
+
+
+def _checked_operand_index(circuit: Circuit) -> _OperandIndex:
+    # counting the units of a circuit takes time linear in its width, so the
+    # count is only compared once every n_units lookups, which keeps lookups
+    # O(1) amortized; units renamed or removed outside the builder are
+    # dropped from the index by then, and until then tket rejects them itself
+    index = getattr(circuit, _INDEX_ATTR, None)
+    if index is None:
+        return _rebuild_operand_index(circuit)
+    index.lookups_left -= 1
+    if index.lookups_left < 0:
+        if circuit.n_qubits + circuit.n_bits != index.n_units:
+            return _rebuild_operand_index(circuit)
+        index.lookups_left = index.n_units
+    return index
+
+
+def operand_index(circuit: Circuit) -> set[Qubit | Bit]:
+    """Return the set of units known to be in the circuit, building it if needed."""
+    return _checked_operand_index(circuit).units
+
+
+def missing_operands(
+    circuit: Circuit,
+    operands: Iterable[Qubit | Bit],
+) -> list[Qubit | Bit]:
+    """Return the operands which are not contained in the circuit."""
+    units = _checked_operand_index(circuit).units
+    missing = [operand for operand in operands if operand not in units]
+    if missing:
+        # units may have been added, renamed or removed with the plain
+        # Circuit methods, resync once
+        units = _rebuild_operand_index(circuit).units
+        missing = [operand for operand in missing if operand not in units]
+    return missing
+
+
+def add_qubits(circuit: Circuit, qubits: Iterable[Qubit]) -> None:
+    """Add qubits to the circuit if not already present and keep the index updated."""
+    index = _checked_operand_index(circuit)
+    for qubit in qubits:
+        if qubit not in index.units:
+            circuit.add_qubit(qubit, reject_dups=False)
+            index.units.add(qubit)
+            index.n_units += 1
+
+
+def add_bits(circuit: Circuit, bits: Iterable[Bit]) -> None:
+    """Add bits to the circuit if not already present and keep the index updated."""
+    index = _checked_operand_index(circuit)
+    for bit in bits:
+        if bit not in index.units:
+            circuit.add_bit(bit, reject_dups=False)
+            index.units.add(bit)
+            index.n_units += 1
@@ -1,28 +1,54 @@
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
+from enum import IntEnum
 
 from pytket import Circuit, Qubit
-from pytket._tket.circuit import CircBox as TketCircBox
 
+from pytket_circuit_builder_api.commands.command_interface import (
+    BuildProgress,
+    stream_chunks,
+)
+from pytket_circuit_builder_api.extensions import auto_install_enabled
+from pytket_circuit_builder_api.operand_index import add_qubits
 from pytket_circuit_builder_api.operators.operator_interface import (
     TketCompatibleOperator,
 )
 
 
-@dataclass
+class AppendKind(IntEnum):
+    """How an OpCommand is appended to a tket circuit."""
+
+    GATE = 0
+    CIRCBOX = 1
+    QCONTROL = 2
+
+
+@dataclass(frozen=True, slots=True)
 class OpCommand:
     operator: TketCompatibleOperator
     qubits: Sequence[Qubit]
-    append_logic: str = "standard"
+    append_kind: AppendKind = AppendKind.GATE
+
+    def __post_init__(self):
+        if type(self.qubits) is not tuple:
+            object.__setattr__(self, "qubits", tuple(self.qubits))
 
     def append_to_tket_circuit(self, circuit: Circuit) -> None:
         """Append command to circuit."""
-        if self.append_logic == "circbox":
-            circuit.add_circbox(TketCircBox(self.operator._circuit), self.qubits)
-        elif self.append_logic == "qcontrol":
-            circuit.add_qcontrolbox(self.operator._box, self.qubits)
+        append_kind = self.append_kind
+        if append_kind is AppendKind.GATE:
+            # interned operators carry their prebuilt op
+            op = getattr(self.operator, "_op", None)
+            if op is None:
+                op = self.operator.to_tket_op()
+            circuit.add_gate(op, self.qubits)
+        elif append_kind is AppendKind.CIRCBOX:
+            # the append kind tells which box the operator carries
+            box = self.operator._tket_box  # type: ignore[attr-defined]
+            circuit.add_circbox(box, self.qubits)
         else:
-            circuit.add_gate(self.operator.to_tket_op(), self.qubits)
+            box = self.operator._box  # type: ignore[attr-defined]
+            circuit.add_qcontrolbox(box, self.qubits)
 
 
 def append_func2(self: Circuit, command: OpCommand) -> None:
@@ -40,12 +66,35 @@ def from_operation_list_func2(commands: Iterable[OpCommand]) -> Circuit:
     """Construct a circuit from a list of operations, add qubits as needed."""
     circuit = Circuit()
     for command in commands:
-        for qubit in command.qubits:
-            circuit.add_qubit(qubit, reject_dups=False)
+        add_qubits(circuit, command.qubits)
         command.append_to_tket_circuit(circuit)
     return circuit
 
 
-Circuit.add_command2 = append_func2
-Circuit.extend2 = extend_func2
-Circuit.from_operation_list2 = from_operation_list_func2
+def from_operation_stream_func2(
+    commands: Iterable[OpCommand],
+    chunk_size: int = 10_000,
+    progress: Callable[[BuildProgress], None] | None = None,
+) -> Circuit:
+    """Construct a circuit from a stream of operations, lowering it in chunks."""
+    circuit = Circuit()
+
+    def lower_chunk(chunk: list[OpCommand]) -> None:
+        for command in chunk:
+            add_qubits(circuit, command.qubits)
+            command.append_to_tket_circuit(circuit)
+
+    stream_chunks(commands, chunk_size, lower_chunk, progress)
+    return circuit
+
+
+def install() -> None:
+    """Add the operators API methods to pytket Circuit."""
+    Circuit.add_command2 = append_func2  # type: ignore[attr-defined]
+    Circuit.extend2 = extend_func2  # type: ignore[attr-defined]
+    Circuit.from_operation_list2 = from_operation_list_func2  # type: ignore[attr-defined]
+    Circuit.from_operation_stream2 = from_operation_stream_func2  # type: ignore[attr-defined]
+
+
+if auto_install_enabled():
+    install()
@@ -9,16 +9,23 @@ from pytket._tket.circuit import Op, QControlBox
 from pytket._tket.unit_id import BitRegister, QubitRegister
 
 from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.boxes import qcontrol_box, tket_circbox
+from pytket_circuit_builder_api.cache import LRUCache
 from pytket_circuit_builder_api.commands.command_interface import (
     TketCompatibleCommand,
 )
-from pytket_circuit_builder_api.operators.command import OpCommand
+from pytket_circuit_builder_api.operand_index import missing_operands
+from pytket_circuit_builder_api.operators.command import AppendKind, OpCommand
 from pytket_circuit_builder_api.operators.operator_interface import (
     TketCompatibleOperator,
 )
+from pytket_circuit_builder_api.ops import tket_op
 
 Oprnd = TypeVar("Oprnd", Qubit, Bit)
 
+operator_registry: LRUCache[TketCompatibleOperator] = LRUCache(maxsize=4096)
+_singletons: dict[type, TketCompatibleOperator] = {}
+
 
 def _is_unique_list(list_to_check: list[Any]) -> bool:
     return len(list_to_check) == len(set(list_to_check))
@@ -28,13 +35,9 @@ def _raise_if_operands_missing_from_circuit(
     circuit: Circuit,
     operands: Sequence[Qubit | Bit],
 ) -> None:
-    circuit_operands: list[Qubit | Bit] = circuit.qubits + circuit.bits
-    missing_operands: list[Qubit | Bit] = []
-    for operand in operands:
-        if operand not in circuit_operands:
-            missing_operands.append(operand)
-    msg = f"Operands {missing_operands} are not contained in circuit"
-    if missing_operands:
+    missing = missing_operands(circuit, operands)
+    msg = f"Operands {missing} are not contained in circuit"
+    if missing:
         raise Exception(msg)
 
 
@@ -42,9 +45,35 @@ def _sub(operand: Oprnd, subs: dict[Oprnd, Oprnd]) -> Oprnd:
     return subs.get(operand, operand)
 
 
-class CX(TketCompatibleOperator):
+class _InternedOperator(type(TketCompatibleOperator)):  # type: ignore[misc]
+    """Metaclass sharing one instance between operators built from equal arguments.
+
+    Operators built without arguments are process-wide singletons, the others
+    are shared through operator_registry. Operators built from unhashable
+    arguments are not shared.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if not args and not kwargs:
+            singleton = _singletons.get(cls)
+            if singleton is None:
+                singleton = _singletons[cls] = super().__call__()
+            return singleton
+        key = (cls, args, tuple(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return super().__call__(*args, **kwargs)
+        create = super().__call__
+        return operator_registry.get_or_create(key, lambda: create(*args, **kwargs))
+
+
+class CX(TketCompatibleOperator, metaclass=_InternedOperator):
+    def __init__(self) -> None:
+        self._op = tket_op(OpType.CX)
+
     def __call__(self, target: Qubit, control: Qubit) -> OpCommand:
-        return OpCommand(self, [target, control])
+        return OpCommand(self, (target, control))
 
     def params(self) -> list[Angle]:
         return []
@@ -53,15 +82,19 @@ class CX(TketCompatibleOperator):
         return OpType.CX
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type())
+        return self._op
 
 
 @dataclass(frozen=True)
-class Rz(TketCompatibleOperator):
+class Rz(TketCompatibleOperator, metaclass=_InternedOperator):
     angle: Angle
+    _op: Op = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_op", tket_op(OpType.Rz, (self.angle.param,)))
 
     def __call__(self, target: Qubit) -> OpCommand:
-        return OpCommand(self, [target])
+        return OpCommand(self, (target,))
 
     def params(self) -> list[Angle]:
         return [self.angle]
@@ -70,15 +103,19 @@ class Rz(TketCompatibleOperator):
         return OpType.Rz
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type(), self.angle.expr)
+        return self._op
 
 
-@dataclass
-class CRz(TketCompatibleOperator):
+@dataclass(frozen=True)
+class CRz(TketCompatibleOperator, metaclass=_InternedOperator):
     angle: Angle
+    _op: Op = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_op", tket_op(OpType.CRz, (self.angle.param,)))
 
     def __call__(self, target: Qubit, control: Qubit) -> OpCommand:
-        return OpCommand(self, [target, control])
+        return OpCommand(self, (target, control))
 
     def params(self) -> list[Angle]:
         return [self.angle]
@@ -87,15 +124,15 @@ class CRz(TketCompatibleOperator):
         return OpType.CRz
 
     def to_tket_op(self) -> Op:
-        return Op.create(self.tket_op_type(), self.angle.expr)
+        return self._op
 
 
-@dataclass
-class QControlled(TketCompatibleOperator):
+@dataclass(frozen=True)
+class QControlled(TketCompatibleOperator, metaclass=_InternedOperator):
     operator: TketCompatibleOperator
     n_control_qubits: int
-    control_state: Sequence[bool] = field(default_factory=list)
-    _box: QControlBox | None = field(init=False, default=None)
+    control_state: Sequence[bool] = ()
+    _box: QControlBox | None = field(init=False, default=None, compare=False)
 
     def __post_init__(self):
         if self.control_state:
@@ -103,17 +140,26 @@ class QControlled(TketCompatibleOperator):
                 raise Exception(
                     "Control state length must match number of  control qubits",
                 )
+            object.__setattr__(self, "control_state", tuple(self.control_state))
         else:
-            self.control_state = [True for _ in range(self.n_control_qubits)]
+            object.__setattr__(
+                self,
+                "control_state",
+                tuple(True for _ in range(self.n_control_qubits)),
+            )
 
-        self._box = QControlBox(
-            self.operator.to_tket_op(),
-            n_controls=self.n_control_qubits,
-            control_state=self.control_state,
+        object.__setattr__(
+            self,
+            "_box",
+            qcontrol_box(
+                self.operator.to_tket_op(),
+                n_controls=self.n_control_qubits,
+                control_state=self.control_state,
+            ),
         )
 
     def __call__(self, qubits: Sequence[Qubit]) -> OpCommand:
-        return OpCommand(self, qubits, append_logic="qcontrol")
+        return OpCommand(self, tuple(qubits), AppendKind.QCONTROL)
 
     def params(self) -> list[Angle]:
         return self.operator.params()
@@ -147,9 +193,10 @@ class CircBox(TketCompatibleOperator):
         # make self._circuit simple
         self._circuit.rename_units(reverse_qubit_map)
         self._circuit.rename_units(reverse_bit_map)
+        self._tket_box = tket_circbox(self._circuit)
 
     def __call__(self, qubits: Sequence[Qubit]) -> OpCommand:
-        return OpCommand(self, qubits, append_logic="circbox")
+        return OpCommand(self, tuple(qubits), AppendKind.CIRCBOX)
 
     def params(self) -> list[Angle]:
         return []
@@ -173,6 +220,7 @@ class CommandTemplate:
         template_command: TketCompatibleCommand,
         template_qubits: Sequence[Qubit],
         template_bits: Sequence[Bit] = [],
+        name: str | None = None,
     ) -> None:
         if set(template_command.qubits()) != set(template_qubits):
             raise Exception(
@@ -187,6 +235,7 @@ class CommandTemplate:
         self.template_qubits = template_qubits
         self.template_bits = template_bits
         self.template_command = template_command
+        self.name = name or type(template_command).__name__
 
     def apply_to(
         self,
@@ -242,6 +291,7 @@ def pytket_operator(
         template_qubits=initial_qubits,
         template_bits=initial_bits,
         template_command=func(*initial_args),
+        name=func.__qualname__,
     )
 
     @functools.wraps(func)
@@ -279,7 +329,7 @@ def pytket_circbox(func: Callable[..., Iterable[TketCompatibleCommand]]):
             )
 
     for command in func(*initial_args):
-        circuit.add_command(command)
+        command.append_to_tket_circuit(circuit)
 
     qubits, bits = split_qubits_bits(initial_args)
 
@@ -287,6 +337,7 @@ def pytket_circbox(func: Callable[..., Iterable[TketCompatibleCommand]]):
         template_qubits=qubits,
         template_bits=bits,
         template_command=CircBox(circuit),
+        name=func.__qualname__,
     )
 
     @functools.wraps(func)
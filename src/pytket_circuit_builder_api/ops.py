@@ -0,0 +1,18 @@
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from pytket import OpType
+from pytket._tket.circuit import Op
+
+from pytket_circuit_builder_api.cache import LRUCache
+
+if TYPE_CHECKING:
+    import sympy
+
+op_cache: LRUCache[Op] = LRUCache(maxsize=4096)
+
+
+def tket_op(op_type: OpType, params: Sequence["float | sympy.Expr"] = ()) -> Op:
+    """Return the interned tket op for an op type and its parameters."""
+    key = (op_type, tuple(params))
+    return op_cache.get_or_create(key, lambda: Op.create(op_type, list(params)))
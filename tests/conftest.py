@@ -0,0 +1,4 @@
+from pytket_circuit_builder_api import extensions
+
+# the tests use the Circuit methods added by the extensions
+extensions.install()
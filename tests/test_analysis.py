@@ -0,0 +1,141 @@
+import random
+
+from pytket import Bit, Circuit, OpType, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket.passes import DecomposeBoxes
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.analysis import analyze, box_summaries
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+    pytket_circbox,
+)
+from pytket_circuit_builder_api.commands.conditional import (
+    Conditional,
+    PytketCondition,
+    QasmCondition,
+)
+
+Q = QubitRegister("Q", 4)
+C = BitRegister("C", 2)
+
+
+@pytket_circbox
+def inner(q0: Qubit, q1: Qubit) -> CircBox:
+    yield CX(q0, q1)
+    yield Rz(Angle(0.2), q1)
+    yield CX(q0, q1)
+
+
+@pytket_circbox
+def outer(q0: Qubit, q1: Qubit, q2: Qubit) -> CircBox:
+    yield Rz(Angle(0.1), q2)
+    yield inner(q0, q1)
+    yield inner(q1, q2)
+
+
+def flat_depth(commands: list) -> int:
+    circuit = Circuit.from_operation_stream(commands)
+    DecomposeBoxes(excluded_types={OpType.QControlBox}).apply(circuit)
+    return circuit.depth()
+
+
+def test_layers_and_critical_path() -> None:
+    commands = [
+        Rz(Angle(0.1), Q[0]),
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.1), Q[2]),
+        CRz(Angle(0.3), Q[2], Q[1]),
+        Rz(Angle(0.1), Q[3]),
+    ]
+    analysis = analyze(commands)
+    assert analysis.depth == 3
+    assert analysis.n_gates == 5
+    assert analysis.layers == (0, 1, 0, 2, 0)
+    assert analysis.critical_path == (0, 1, 3)
+    assert analysis.gate_counts == {Q[0]: 2, Q[1]: 2, Q[2]: 2, Q[3]: 1}
+
+
+def test_conditions_are_dependencies() -> None:
+    commands = [
+        Rz(Angle(0.1), Q[0]),
+        Conditional(Rz(Angle(0.1), Q[0]), QasmCondition([C[0]], 1)),
+        Conditional(Rz(Angle(0.1), Q[1]), QasmCondition([C[0]], 1)),
+        Conditional(Rz(Angle(0.1), Q[2]), PytketCondition(C[0] & C[1])),
+    ]
+    analysis = analyze(commands)
+    # conditionals on the same bit share a layer
+    assert analysis.layers == (0, 1, 0, 0)
+    # tket adds a classical operation computing the expression of a pytket
+    # condition, so only the qasm conditions are compared
+    assert analysis.depth == Circuit.from_operation_stream(commands[:3]).depth()
+    assert set(analysis.gate_counts) == {Q[0], Q[1], Q[2]}
+
+
+def test_writes_wait_for_reads() -> None:
+    measure = CircBox(Circuit(1, 1).Measure(0, 0)).sub({Qubit(0): Q[3]}, {Bit(0): C[1]})
+    commands = [
+        Rz(Angle(0.1), Q[0]),
+        Conditional(Rz(Angle(0.1), Q[0]), QasmCondition([C[1]], 1)),
+        Conditional(Rz(Angle(0.1), Q[1]), PytketCondition(C[0] & C[1])),
+        measure,
+        Conditional(Rz(Angle(0.1), Q[2]), PytketCondition(C[0] & C[1])),
+    ]
+    analysis = analyze(commands)
+    assert analysis.layers == (0, 1, 0, 2, 3)
+    assert analysis.critical_path == (0, 1, 3, 4)
+
+
+def test_nested_boxes_match_flattened_depth() -> None:
+    box_summaries.clear()
+    commands = [
+        Rz(Angle(0.1), Q[3]),
+        outer(Q[0], Q[1], Q[2]),
+        CX(Q[3], Q[0]),
+        QControlled(Rz(Angle(0.5), Q[2]), [Q[3]]),
+        outer(Q[3], Q[2], Q[1]),
+    ]
+    analysis = analyze(commands)
+    assert analysis.depth == flat_depth(commands)
+    assert analysis.n_gates == 1 + 7 + 1 + 1 + 7
+    # the box starts as soon as the qubit it uses first is free
+    assert analysis.layers == (0, 0, 3, 6, 6)
+    # one summary per definition, inner only summarized once
+    assert box_summaries.stats().size == 2
+
+
+def test_random_circuits_match_tket_depth() -> None:
+    rng = random.Random(1)
+    for _ in range(20):
+        commands = []
+        for _ in range(60):
+            a, b, c = rng.sample(range(4), 3)
+            kind = rng.randrange(4)
+            if kind == 0:
+                commands.append(Rz(Angle(0.1), Q[a]))
+            elif kind == 1:
+                commands.append(CX(Q[a], Q[b]))
+            elif kind == 2:
+                commands.append(outer(Q[a], Q[b], Q[c]))
+            else:
+                condition = QasmCondition([C[rng.randrange(2)]], 1)
+                commands.append(Conditional(Rz(Angle(0.1), Q[a]), condition))
+        assert analyze(commands).depth == flat_depth(commands)
+
+
+def test_command_buffer() -> None:
+    buffer = CommandBuffer.from_commands([CX(Q[i], Q[i + 1]) for i in range(3)])
+    analysis = analyze(buffer)
+    assert analysis.depth == 3
+    assert analysis.critical_path == (0, 1, 2)
+
+
+def test_empty() -> None:
+    analysis = analyze([])
+    assert analysis.depth == 0
+    assert analysis.critical_path == ()
+    assert analysis.gate_counts == {}
@@ -0,0 +1,39 @@
+import sympy
+from pytket import Circuit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CRz, Rz
+
+
+def test_numeric_angle_skips_sympy() -> None:
+    angle = Angle(0.3)
+    assert not angle.is_symbolic()
+    assert angle.param == 0.3
+    assert angle._expr is None
+    assert angle.expr == sympy.Float(0.3)
+
+    assert Angle(1).param == 1.0
+    assert Angle("1/4").value == 0.25
+
+
+def test_symbolic_angle_interned() -> None:
+    a1 = Angle("a")
+    a2 = Angle("a")
+    assert a1.is_symbolic()
+    assert a1.expr is a2.expr
+    assert a1.param == sympy.Symbol("a")
+
+
+def test_numeric_and_symbolic_lowering() -> None:
+    Q = QubitRegister("Q", 2)
+    circuit = Circuit.from_operation_list(
+        [
+            Rz(Angle(0.3), Q[0]),
+            CRz(Angle(0.5), Q[0], Q[1]),
+            CRz(Angle("a"), Q[1], Q[0]),
+        ],
+    )
+    params = [command.op.params[0] for command in circuit.get_commands()]
+    assert params[:2] == [0.3, 0.5]
+    assert params[2] == sympy.Symbol("a")
+    assert Rz(Angle(0.3), Q[0]).to_tket_op().params == [0.3]
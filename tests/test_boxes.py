@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pytket import Circuit, Qubit
+from pytket._tket.passes import DecomposeBoxes
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.boxes import (
+    n_tket_circboxes,
+    qcontrolbox_registry,
+    reset_tket_circbox_count,
+)
+from pytket_circuit_builder_api.cache import LRUCache
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    QControlled,
+    Rz,
+    pytket_circbox,
+)
+from pytket_circuit_builder_api.operators.operators import CircBox as CircBoxOperator
+from pytket_circuit_builder_api.operators.operators import (
+    QControlled as QControlledOperator,
+)
+from pytket_circuit_builder_api.operators.operators import Rz as RzOperator
+
+
+def test_circbox_built_once_per_definition() -> None:
+    reset_tket_circbox_count()
+
+    @pytket_circbox
+    def ladder(q0: Qubit, q1: Qubit, q2: Qubit) -> CircBox:
+        yield CX(q0, q1)
+        yield CX(q1, q2)
+
+    Q = QubitRegister("Q", 4)
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    circuit.extend(
+        [ladder(Q[i % 4], Q[(i + 1) % 4], Q[(i + 2) % 4]) for i in range(50)]
+    )
+    assert n_tket_circboxes() == 1
+    assert circuit.n_gates == 50
+
+    DecomposeBoxes().apply(circuit)
+    assert circuit.n_gates == 100
+
+
+def test_circbox_operator_built_once() -> None:
+    reset_tket_circbox_count()
+    Q = QubitRegister("Q", 2)
+    box = CircBoxOperator(Circuit.from_operation_list([CX(Q[0], Q[1])]))
+    circuit = Circuit.from_operation_list2([box([Q[0], Q[1]]) for _ in range(10)])
+    assert n_tket_circboxes() == 1
+    assert circuit.n_gates == 10
+
+
+def test_qcontrolbox_registry_shares_boxes() -> None:
+    qcontrolbox_registry.clear()
+    Q = QubitRegister("Q", 4)
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    gate = QControlled(Rz(Angle(0.25), Q[0]), [Q[1], Q[2]], [True, False])
+    circuit.extend([gate, gate.sub({Q[0]: Q[3], Q[1]: Q[0]})])
+    circuit.add_command(QControlled(Rz(Angle(0.25), Q[1]), [Q[2], Q[3]]))
+
+    stats = qcontrolbox_registry.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+    assert gate.sub({Q[0]: Q[3]}).control_state == (True, False)
+
+    QControlledOperator(RzOperator(Angle(0.25)), 2, [True, False])
+    assert qcontrolbox_registry.stats().hits == 2
+
+    qcontrolbox_registry.clear()
+    assert len(qcontrolbox_registry) == 0
+
+
+def test_qcontrolbox_registry_eviction() -> None:
+    qcontrolbox_registry.clear()
+    qcontrolbox_registry.resize(2)
+    try:
+        for angle in [0.1, 0.2, 0.3, 0.1]:
+            # a list control state is unhashable, so the operator is not interned
+            QControlledOperator(RzOperator(Angle(angle)), 1, [True])
+        stats = qcontrolbox_registry.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.size) == (0, 4, 2, 2)
+    finally:
+        qcontrolbox_registry.resize(4096)
+        qcontrolbox_registry.clear()
+
+
+def test_registry_shared_between_threads() -> None:
+    registry: LRUCache[object] = LRUCache(maxsize=2)
+
+    def create() -> object:
+        # give the other threads time to miss the same key
+        time.sleep(0.01)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(
+            executor.map(lambda i: registry.get_or_create(i % 3, create), range(60))
+        )
+    # evicting under contention neither fails nor loses count
+    stats = registry.stats()
+    assert stats.hits + stats.misses == 60
+    assert len(registry) == 2
+
+    registry.clear()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(
+            executor.map(lambda _: registry.get_or_create("box", create), range(8))
+        )
+    assert all(value is values[0] for value in values)
+    assert registry.stats().misses == 1
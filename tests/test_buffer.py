@@ -0,0 +1,70 @@
+import numpy as np
+from pytket import Circuit, OpType
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.commands import CX, CRz, Rz
+from pytket_circuit_builder_api.commands.deferred import DeferredCircuit
+
+
+def test_buffer_round_trip() -> None:
+    Q = QubitRegister("Q", 3)
+    commands = [
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.3), Q[2]),
+        CRz(Angle("a"), Q[1], Q[2]),
+        Rz(Angle(0.3), Q[0]),
+    ]
+    buffer = CommandBuffer.from_commands(commands)
+    assert len(buffer) == 4
+    assert buffer.opcodes.tolist() == [0, 1, 2, 1]
+    assert buffer.qubit_offsets.tolist() == [0, 2, 3, 5, 6]
+    assert len(buffer.params()) == 2
+
+    round_tripped = buffer.to_commands()
+    assert [type(command) for command in round_tripped] == [CX, Rz, CRz, Rz]
+    assert [command.qubits() for command in round_tripped] == [
+        command.qubits() for command in commands
+    ]
+
+    circuit = Circuit.from_command_buffer(buffer)
+    expected = Circuit.from_operation_list(commands)
+    assert circuit.get_commands() == expected.get_commands()
+
+
+def test_buffer_vectorized_build() -> None:
+    Q = QubitRegister("Q", 6)
+    buffer = CommandBuffer(Q)
+    targets = np.arange(0, 5)
+    buffer.add_gates(OpType.CX, np.stack([targets, targets + 1], axis=1))
+    buffer.add_gates(OpType.Rz, np.arange(6), params=np.linspace(0, 1, 6))
+    buffer.add_gates(OpType.CRz, [[0, 5]], params="b")
+    assert len(buffer) == 12
+    assert buffer.nbytes <= 16 * len(buffer)
+
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    circuit.add_command(buffer)
+    assert circuit.n_gates == 12
+    assert circuit.n_gates_of_type(OpType.CX) == 5
+    assert circuit.free_symbols() == {Angle("b").expr}
+
+
+def test_buffer_as_command() -> None:
+    Q = QubitRegister("Q", 3)
+    commands = [CX(Q[0], Q[1]), Rz(Angle(0.3), Q[2]), CRz(Angle("a"), Q[1], Q[2])]
+    buffer = CommandBuffer.from_commands(commands)
+    expected = Circuit.from_operation_list([Rz(Angle(0.1), Q[0]), *commands])
+
+    for build in (Circuit.from_operation_list, Circuit.from_operation_stream):
+        circuit = build([Rz(Angle(0.1), Q[0]), buffer])
+        assert circuit.get_commands() == expected.get_commands()
+
+    deferred = DeferredCircuit([Rz(Angle(0.1), Q[0]), buffer])
+    assert deferred.qubits() == [Q[0], Q[1], Q[2]]
+    assert deferred.gate_counts() == {OpType.Rz: 1, OpType.CircBox: 1}
+    assert deferred.materialize().get_commands() == expected.get_commands()
+
+    renamed = buffer.sub({Q[2]: Q[0]})
+    assert renamed.qubits() == [Q[0], Q[1]]
+    assert buffer.to_tket_op().get_circuit().n_gates == 3
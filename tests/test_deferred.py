@@ -0,0 +1,46 @@
+from pytket import Circuit, OpType
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, CRz, QControlled, Rz
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.commands.deferred import DeferredCircuit
+
+
+def test_deferred_queries_without_lowering() -> None:
+    Q = QubitRegister("Q", 3)
+    C = BitRegister("C", 1)
+    deferred = DeferredCircuit(
+        [
+            CX(Q[0], Q[1]),
+            Rz(Angle("a"), Q[2]),
+            CRz(Angle(0.5), Q[1], Q[2]),
+            Conditional(CX(Q[2], Q[0]), QasmCondition([C[0]], 1)),
+        ],
+    )
+    assert deferred.qubits() == [Q[0], Q[1], Q[2]]
+    assert deferred.bits() == [C[0]]
+    assert [param.param for param in deferred.params()] == [Angle("a").expr, 0.5]
+    assert deferred.gate_counts() == {
+        OpType.CX: 1,
+        OpType.Rz: 1,
+        OpType.CRz: 1,
+        OpType.Conditional: 1,
+    }
+    assert deferred.depth_estimate() == 3
+    assert not deferred.is_materialized
+
+
+def test_deferred_incremental_materialization() -> None:
+    Q = QubitRegister("Q", 4)
+    commands = [CX(Q[0], Q[1]), QControlled(Rz(Angle(0.2), Q[2]), [Q[0], Q[1]])]
+    deferred = DeferredCircuit(commands)
+    circuit = deferred.materialize()
+    assert circuit.n_gates == 2
+    assert deferred.is_materialized
+
+    deferred.add_command(CX(Q[3], Q[2]))
+    assert not deferred.is_materialized
+    assert deferred.materialize() is circuit
+    assert circuit.n_gates == 3
+    expected = Circuit.from_operation_list([*commands, CX(Q[3], Q[2])])
+    assert circuit.get_commands() == expected.get_commands()
@@ -0,0 +1,104 @@
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+
+from pytket import Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands import disk_cache
+from pytket_circuit_builder_api.commands.commands import CX, CircBox, CRz, Rz
+from pytket_circuit_builder_api.commands.disk_cache import CircuitDiskCache
+
+Q = QubitRegister("Q", 3)
+LOGGER = logging.getLogger("builder")
+disabled = threading.Event()
+
+
+def test_from_operation_list_cache(tmp_path: Path) -> None:
+    commands = [CX(Q[0], Q[1]), CRz(Angle("a"), Q[1], Q[2])]
+    cache = CircuitDiskCache(tmp_path)
+    built = cache.from_operation_list(commands)
+    loaded = CircuitDiskCache(tmp_path).from_operation_list(iter(commands))
+    assert loaded == built
+    assert cache.stats().misses == 1
+    assert cache.stats().n_entries == 1
+
+    cache.from_operation_list(commands[:1])
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.n_entries) == (0, 2, 2)
+
+
+def test_circbox_body_loaded_from_cache(tmp_path: Path) -> None:
+    cache = CircuitDiskCache(tmp_path)
+
+    def body(q0: Qubit, q1: Qubit) -> CircBox:
+        yield CX(q0, q1)
+        yield Rz(Angle(0.5), q1)
+
+    first = cache.pytket_circbox(body)
+    second = cache.pytket_circbox(cache_size=4)(body)
+    assert first(Q[0], Q[1]) == second(Q[0], Q[1])
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_function_key_includes_captured_values(tmp_path: Path) -> None:
+    cache = CircuitDiskCache(tmp_path)
+
+    def make(n_gates: int, angle: Angle = Angle(0.5)):
+        def body(q0: Qubit, q1: Qubit) -> CircBox:
+            for _ in range(n_gates):
+                yield Rz(angle, q1)
+
+        return body
+
+    assert cache.function_key(make(1)) == cache.function_key(make(1))
+    assert cache.function_key(make(1)) != cache.function_key(make(3))
+    assert cache.function_key(make(1)) != cache.function_key(make(1, Angle(0.2)))
+    one = cache.pytket_circbox(make(1))(Q[0], Q[1])
+    three = cache.pytket_circbox(make(3))(Q[0], Q[1])
+    assert one._circuit.n_gates == 1
+    assert three._circuit.n_gates == 3
+
+
+def test_function_key_of_globals(tmp_path: Path, caplog) -> None:
+    cache = CircuitDiskCache(tmp_path)
+
+    def logged(q0: Qubit) -> CircBox:
+        # disabled is an attribute here, not the unkeyable global
+        if not LOGGER.disabled:
+            LOGGER.info("building")
+        yield Rz(Angle(0.5), q0)
+
+    cache.function_key(logged)
+
+    def unkeyable(q0: Qubit) -> CircBox:
+        if not disabled.is_set():
+            yield Rz(Angle(0.5), q0)
+
+    with pytest.raises(Exception, match="Cannot derive a cache key"):
+        cache.function_key(unkeyable)
+    with caplog.at_level(logging.WARNING):
+        box = cache.pytket_circbox(unkeyable)(Q[0])
+    assert box._circuit.n_gates == 1
+    assert "without the disk cache" in caplog.text
+    assert cache.stats().n_entries == 0
+
+
+def test_eviction_and_versioning(tmp_path: Path, monkeypatch) -> None:
+    cache = CircuitDiskCache(tmp_path, max_bytes=1)
+    cache.from_operation_list([CX(Q[0], Q[1])])
+    stats = cache.stats()
+    assert (stats.evictions, stats.n_entries) == (1, 0)
+
+    (tmp_path / "user_data").mkdir()
+    cache = CircuitDiskCache(tmp_path)
+    cache.from_operation_list([CX(Q[0], Q[1])])
+    monkeypatch.setattr(disk_cache, "CACHE_VERSION", "9.9.9-pytket9.9.9")
+    upgraded = CircuitDiskCache(tmp_path)
+    assert upgraded.stats().n_entries == 0
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir()) == [
+        "9.9.9-pytket9.9.9",
+        "user_data",
+    ]
@@ -0,0 +1,80 @@
+import pytest
+from pytket import Circuit, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+)
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.commands.hashing import (
+    HashConsTable,
+    structural_digest,
+)
+from pytket_circuit_builder_api.operators import operators as ops
+
+Q = QubitRegister("Q", 3)
+C = BitRegister("C", 1)
+
+
+def _inner_circuit() -> Circuit:
+    return Circuit.from_operation_list(
+        [CX(Q[0], Q[1]), QControlled(Rz(Angle(0.2), Q[1]), [Q[0]])],
+    )
+
+
+def test_structural_equality() -> None:
+    assert Angle(0.5) == Angle("1/2")
+    assert Angle("a") != Angle("b")
+    assert CRz(Angle("a"), Q[0], Q[1]) == CRz(Angle("a"), Q[0], Q[1])
+    assert hash(QControlled(Rz(Angle(0.1), Q[0]), [Q[1]])) == hash(
+        QControlled(Rz(Angle(0.1), Q[0]), [Q[1]]),
+    )
+    assert CircBox(_inner_circuit()) == CircBox(_inner_circuit())
+    assert len({CircBox(_inner_circuit()), CircBox(_inner_circuit())}) == 1
+    conditional = Conditional(CX(Q[0], Q[1]), QasmCondition([C[0]], 1))
+    assert hash(conditional) == hash(
+        Conditional(CX(Q[0], Q[1]), QasmCondition([C[0]], 1)),
+    )
+    assert CircBox(_inner_circuit()) != CircBox(
+        Circuit.from_operation_list([CX(Q[0], Q[1])]),
+    )
+
+
+def test_structural_digest_is_stable() -> None:
+    commands = [CX(Q[0], Q[1]), CRz(Angle("a"), Q[1], Qubit("anc", 0))]
+    assert structural_digest(commands) == structural_digest(list(commands))
+    assert structural_digest(commands) != structural_digest(commands[::-1])
+    assert structural_digest(CircBox(_inner_circuit())) == structural_digest(
+        [CircBox(_inner_circuit())],
+    )
+
+
+def test_structural_digest_requires_structural_keys() -> None:
+    # the repr of an OpCommand contains the address of its operator
+    with pytest.raises(Exception, match="no structural key"):
+        structural_digest([CX(Q[0], Q[1]), ops.CX()(Q[0], Q[1])])
+
+
+def test_hash_consing() -> None:
+    table = HashConsTable()
+    first_box = CircBox(_inner_circuit())
+    second_box = CircBox(_inner_circuit()).sub({Q[0]: Q[2]})
+    commands = table.intern_all(
+        [
+            QControlled(Rz(Angle(0.1), Q[0]), [Q[1]]),
+            first_box,
+            second_box,
+            QControlled(Rz(Angle(0.1), Q[0]), [Q[1]]),
+            Rz(Angle(0.1), Q[0]),
+        ],
+    )
+    assert commands[0] is commands[3]
+    assert commands[4] is commands[0].command
+    assert commands[1] is first_box
+    assert commands[2]._tket_box is first_box._tket_box
+    assert commands[2].qubits() == second_box.qubits()
+    assert len(table) == 4
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+CHECK = """
+import sys
+from pytket import Circuit
+import pytket_circuit_builder_api.commands.commands
+import pytket_circuit_builder_api.commands.conditional
+import pytket_circuit_builder_api.operators.operators
+from pytket_circuit_builder_api.angle import Angle
+print(hasattr(Circuit, "from_operation_list"), "sympy" in sys.modules)
+Angle(0.5)
+print("sympy" in sys.modules)
+Angle("a")
+print("sympy" in sys.modules)
+from pytket_circuit_builder_api import extensions
+extensions.install()
+print(hasattr(Circuit, "from_operation_list"), hasattr(Circuit, "extend2"))
+"""
+
+
+def run_check(auto_install: str | None) -> list[str]:
+    env = dict(os.environ)
+    env.pop("PYTKET_CIRCUIT_BUILDER_AUTO_INSTALL", None)
+    if auto_install is not None:
+        env["PYTKET_CIRCUIT_BUILDER_AUTO_INSTALL"] = auto_install
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split("\n")[:-1]
+
+
+def test_import_without_side_effects() -> None:
+    assert run_check(None) == ["False False", "False", "True", "True True"]
+    assert run_check("0")[0] == "False False"
+
+
+def test_automatic_install() -> None:
+    assert run_check("1")[0] == "True False"
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+from pytket import Circuit, Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api import instrumentation
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    QControlled,
+    Rz,
+    pytket_circbox,
+)
+
+
+@pytket_circbox
+def entangle(q0: Qubit, q1: Qubit) -> CircBox:
+    yield CX(q0, q1)
+    yield Rz(Angle(0.25), q1)
+
+
+def test_profile_counts_calls() -> None:
+    Q = QubitRegister("Q", 3)
+    with instrumentation.profile() as profiler:
+        Circuit.from_operation_list(
+            [
+                entangle(Q[0], Q[1]),
+                entangle(q0=Q[1], q1=Q[2]),
+                QControlled(Rz(Angle(0.5), Q[0]), [Q[1]]),
+                CX(Q[0], Q[2]),
+            ],
+        )
+    calls = {(s.category, s.name): s.calls for s in profiler.report()}
+    assert calls[("template", "entangle")] == 2
+    assert calls[("append", "CircBox")] == 2
+    assert calls[("append", "QControlled")] == 1
+    assert calls[("append", "CX")] == 1
+    assert calls[("angle", "Angle")] == 1
+    assert all(s.seconds >= 0 for s in profiler.report())
+
+
+def test_disable_restores_originals() -> None:
+    append = CX.append_to_tket_circuit
+    profiler = instrumentation.enable()
+    assert CX.append_to_tket_circuit is not append
+    assert instrumentation.disable() is profiler
+    assert CX.append_to_tket_circuit is append
+    Angle(0.1)
+    assert profiler.report() == []
+
+
+def test_chrome_trace(tmp_path: Path) -> None:
+    Q = QubitRegister("Q", 2)
+    with instrumentation.profile(trace=True) as profiler:
+        Circuit.from_operation_list([entangle(Q[0], Q[1])])
+    path = tmp_path / "trace.json"
+    profiler.write_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {event["cat"] for event in events} >= {"template", "append"}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
@@ -0,0 +1,49 @@
+from pytket import Circuit, OpType
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.commands.commands import CX
+from pytket_circuit_builder_api.commands.layers import (
+    all_to_all_layers,
+    all_to_all_pairs,
+    brickwork_layers,
+    ladder_layers,
+    pattern_layers,
+)
+
+
+def test_brickwork_matches_comprehension() -> None:
+    q = QubitRegister("q", 5)
+    depth = 6
+    width = q.size
+    expected = Circuit()
+    expected.add_q_register(q)
+    expected.extend(
+        [
+            CX(q[n], q[n + 1])
+            for current_layer in range(depth)
+            for n in range(current_layer % 2, width - 1, 2)
+        ],
+    )
+
+    circuit = Circuit()
+    circuit.add_q_register(q)
+    circuit.extend([brickwork_layers(OpType.CX, list(q), depth)])
+    assert circuit.get_commands() == expected.get_commands()
+
+
+def test_other_layers() -> None:
+    q = QubitRegister("q", 4)
+    buffer = ladder_layers(OpType.CX, list(q), n_layers=2, reverse=True)
+    assert len(buffer) == 6
+    all_to_all_layers(OpType.CRz, list(q), params=0.25, buffer=buffer)
+    assert len(buffer) == 12
+    assert all_to_all_pairs(4).tolist()[:3] == [[0, 1], [0, 2], [0, 3]]
+
+    pattern_layers(
+        OpType.Rz, list(q), [[0], [2]], n_layers=2, shift=1, params="a", buffer=buffer
+    )
+    assert buffer.qubit_indices[-4:].tolist() == [0, 2, 1, 3]
+
+    circuit = Circuit.from_command_buffer(buffer)
+    assert circuit.n_gates_of_type(OpType.CX) == 6
+    assert circuit.n_gates_of_type(OpType.CRz) == 6
+    assert circuit.n_gates_of_type(OpType.Rz) == 4
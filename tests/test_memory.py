@@ -0,0 +1,55 @@
+import dataclasses
+import tracemalloc
+
+import pytest
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, CRz, QControlled, Rz
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.operators.command import AppendKind
+from pytket_circuit_builder_api.operators.operators import CX as CXOperator
+from pytket_circuit_builder_api.operators.operators import QControlled as QCOperator
+from pytket_circuit_builder_api.operators.operators import Rz as RzOperator
+
+Q = QubitRegister("Q", 3)
+C = BitRegister("C", 2)
+
+
+def test_commands_are_slotted_and_immutable() -> None:
+    commands = [
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.1), Q[0]),
+        CRz(Angle(0.1), Q[0], Q[1]),
+        QControlled(Rz(Angle(0.1), Q[0]), [Q[1], Q[2]]),
+        Conditional(Rz(Angle(0.1), Q[0]), QasmCondition([C[0], C[1]], 2)),
+        CXOperator()(Q[0], Q[1]),
+    ]
+    for command in commands:
+        assert not hasattr(command, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            setattr(command, dataclasses.fields(command)[0].name, None)
+
+
+def test_operands_are_tuples() -> None:
+    controlled = QControlled(Rz(Angle(0.1), Q[0]), [Q[1], Q[2]], [True, False])
+    assert controlled.control_qubits == (Q[1], Q[2])
+    assert controlled.control_state == (True, False)
+    assert QasmCondition([C[0]], 1).bits == (C[0],)
+    command = QCOperator(RzOperator(Angle(0.1)), n_control_qubits=1)([Q[1], Q[0]])
+    assert command.qubits == (Q[1], Q[0])
+    assert command.append_kind is AppendKind.QCONTROL
+    assert CXOperator()(Q[0], Q[1]).append_kind is AppendKind.GATE
+
+
+def test_memory_per_command() -> None:
+    n = 10_000
+    q0, q1 = Q[0], Q[1]
+    commands = [None] * n
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        commands[i] = CX(q0, q1)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # an object header and two slots, without an instance dictionary
+    assert held / n <= 64
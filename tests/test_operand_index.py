@@ -0,0 +1,65 @@
+import pytest
+from pytket import Bit, Circuit, Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket.passes import FlattenRegisters
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, Rz
+from pytket_circuit_builder_api.operand_index import (
+    add_qubits,
+    missing_operands,
+    operand_index,
+)
+
+
+def test_missing_operand_message() -> None:
+    Q = QubitRegister("Q", 2)
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    with pytest.raises(Exception, match=r"Operands \[anc\[0\]\] are not contained"):
+        circuit.add_command(CX(Q[0], Qubit("anc", 0)))
+
+
+def test_index_tracks_units_added_outside_builder() -> None:
+    circuit = Circuit()
+    add_qubits(circuit, [Qubit(0), Qubit(1), Qubit(0)])
+    assert operand_index(circuit) == {Qubit(0), Qubit(1)}
+    assert circuit.n_qubits == 2
+
+    circuit.add_q_register(QubitRegister("late", 1))
+    circuit.add_bit(Bit(0))
+    assert missing_operands(circuit, [Qubit("late", 0), Bit(0)]) == []
+    circuit.add_command(Rz(Angle(0.1), Qubit("late", 0)))
+    assert circuit.n_gates == 1
+
+
+def test_from_operation_list_index() -> None:
+    Q = QubitRegister("Q", 3)
+    circuit = Circuit.from_operation_list([CX(Q[0], Q[1]), CX(Q[1], Q[2])])
+    assert operand_index(circuit) == set(circuit.qubits)
+    assert circuit.copy().qubits == circuit.qubits
+
+
+def test_index_resyncs_after_units_change() -> None:
+    Q = QubitRegister("Q", 2)
+    circuit = Circuit.from_operation_list([CX(Q[0], Q[1])])
+    circuit.rename_units({Q[0]: Qubit("R", 0)})
+    # the new name misses the index, which is rebuilt without the old name
+    circuit.add_command(Rz(Angle(0.1), Qubit("R", 0)))
+    with pytest.raises(Exception, match=r"Operands \[Q\[0\]\] are not contained"):
+        circuit.add_command(Rz(Angle(0.1), Q[0]))
+
+    circuit = Circuit.from_operation_list([CX(Q[0], Q[1])])
+    FlattenRegisters().apply(circuit)
+    circuit.add_command(Rz(Angle(0.1), Qubit(1)))
+    with pytest.raises(Exception, match=r"Operands \[Q\[1\]\] are not contained"):
+        circuit.add_command(Rz(Angle(0.1), Q[1]))
+
+
+def test_index_checks_unit_count() -> None:
+    circuit = Circuit()
+    add_qubits(circuit, [Qubit(0), Qubit(1), Qubit(2)])
+    circuit.remove_blank_wires()
+    # the unit count is compared after as many lookups as there are units
+    for _ in range(4):
+        operand_index(circuit)
+    assert operand_index(circuit) == set()
@@ -0,0 +1,57 @@
+from pytket import Circuit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, CRz, Rz
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.operators.operators import CX as CXOperator
+from pytket_circuit_builder_api.operators.operators import CRz as CRzOperator
+from pytket_circuit_builder_api.operators.operators import (
+    QControlled as QControlledOperator,
+)
+from pytket_circuit_builder_api.operators.operators import Rz as RzOperator
+from pytket_circuit_builder_api.operators.operators import operator_registry
+from pytket_circuit_builder_api.ops import op_cache
+
+
+def test_ops_are_interned() -> None:
+    op_cache.clear()
+    Q = QubitRegister("Q", 3)
+    C = BitRegister("C", 1)
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    circuit.add_c_register(C)
+    circuit.extend(
+        [
+            CX(Q[0], Q[1]),
+            CX(Q[1], Q[2]),
+            Rz(Angle(0.5), Q[0]),
+            Rz(Angle(0.5), Q[1]),
+            CRz(Angle("a"), Q[0], Q[2]),
+            Conditional(CX(Q[2], Q[0]), QasmCondition([C[0]], 1)),
+        ],
+    )
+    stats = op_cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (3, 3, 3)
+    assert circuit.n_gates == 6
+    # the CX operator is a singleton, whose op may predate the cache clear
+    assert CXOperator().to_tket_op() == CX(Q[0], Q[1]).to_tket_op()
+    operator_registry.clear()
+    assert RzOperator(Angle(0.5)).to_tket_op() is Rz(Angle(0.5), Q[2]).to_tket_op()
+
+
+def test_operators_are_interned() -> None:
+    Q = QubitRegister("Q", 3)
+    assert CXOperator() is CXOperator()
+    rz = RzOperator(Angle(0.3))
+    assert RzOperator(Angle(0.3)) is rz
+    assert RzOperator(angle=Angle(0.3)) == rz
+    assert RzOperator(Angle(0.4)) is not rz
+    assert CRzOperator(Angle("a")) is CRzOperator(Angle("a"))
+    controlled = QControlledOperator(rz, 2)
+    assert QControlledOperator(RzOperator(Angle(0.3)), 2) is controlled
+    assert controlled.control_state == (True, True)
+
+    circuit = Circuit.from_operation_list2(
+        [rz(Q[0]), rz(Q[1]), CXOperator()(Q[0], Q[1])]
+    )
+    assert circuit.n_gates == 3
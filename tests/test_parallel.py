@@ -0,0 +1,46 @@
+from collections.abc import Iterator
+
+from pytket import Circuit, Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    pytket_circbox,
+)
+from pytket_circuit_builder_api.commands.parallel import Block, build_parallel
+
+Q = QubitRegister("Q", 4)
+
+
+@pytket_circbox
+def entangle(q0: Qubit, q1: Qubit) -> CircBox:
+    yield CX(q0, q1)
+    yield CRz(Angle(0.5), q1, q0)
+
+
+def ladder(*qubits: Qubit) -> Iterator[CX]:
+    for control, target in zip(qubits, qubits[1:]):
+        yield CX(control, target)
+
+
+def test_build_parallel_matches_serial() -> None:
+    blocks = [
+        Block(entangle, (Q[2], Q[3])),
+        Block(ladder, (Q[0], Q[1], Q[2])),
+        Block(ladder, (Qubit(0), Qubit(1)), unit_map={Qubit(0): Q[3], Qubit(1): Q[0]}),
+    ]
+    expected = Circuit.from_operation_list(
+        [
+            CX(Q[2], Q[3]),
+            CRz(Angle(0.5), Q[3], Q[2]),
+            CX(Q[0], Q[1]),
+            CX(Q[1], Q[2]),
+            CX(Q[3], Q[0]),
+        ],
+    )
+    serial = build_parallel(blocks)
+    parallel = build_parallel(blocks, processes=2)
+    assert serial.get_commands() == expected.get_commands()
+    assert parallel.get_commands() == expected.get_commands()
@@ -0,0 +1,83 @@
+from pytket import Circuit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import CX, CRz, QControlled, Rz
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.commands.peephole import PeepholeOptimizer
+
+Q = QubitRegister("Q", 3)
+C = BitRegister("C", 1)
+
+
+def test_merge_cancel_and_drop() -> None:
+    peephole = PeepholeOptimizer()
+    commands = [
+        Rz(Angle(0.25), Q[0]),
+        Rz(Angle(0.5), Q[0]),
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.1), Q[2]),
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.25), Q[0]),
+        CRz(Angle(0.0), Q[1], Q[2]),
+        Rz(Angle("a"), Q[1]),
+        Rz(Angle("b"), Q[1]),
+    ]
+    optimized = list(peephole.optimize(commands))
+    assert optimized == [
+        Rz(Angle(1.0), Q[0]),
+        Rz(Angle(0.1), Q[2]),
+        Rz(Angle("a + b"), Q[1]),
+    ]
+    stats = peephole.stats()
+    assert (stats.n_commands, stats.n_merged, stats.n_cancelled, stats.n_dropped) == (
+        9,
+        3,
+        2,
+        1,
+    )
+    assert stats.n_removed == 6
+
+
+def test_cascading_cancellation() -> None:
+    commands = [
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.3), Q[0]),
+        Rz(Angle(-0.3), Q[0]),
+        CX(Q[0], Q[1]),
+        CX(Q[1], Q[0]),
+    ]
+    assert list(PeepholeOptimizer().optimize(commands)) == [CX(Q[1], Q[0])]
+
+
+def test_boundaries() -> None:
+    commands = [
+        Rz(Angle(0.2), Q[0]),
+        Conditional(Rz(Angle(0.2), Q[0]), QasmCondition([C[0]], 1)),
+        Rz(Angle(0.2), Q[0]),
+        CX(Q[1], Q[2]),
+        QControlled(Rz(Angle(0.0), Q[0]), [Q[1]]),
+        CX(Q[1], Q[2]),
+        CX(Q[2], Q[1]),
+    ]
+    assert list(PeepholeOptimizer().optimize(commands)) == commands
+
+
+def test_window() -> None:
+    # gates emitted once the window is full can no longer be cancelled
+    commands = [CX(Q[1], Q[2]), Rz(Angle(0.1), Q[0]), CX(Q[1], Q[2])]
+    stream = PeepholeOptimizer(window=1).optimize(iter(commands))
+    assert next(stream) == commands[0]
+    assert list(stream) == commands[1:]
+    assert list(PeepholeOptimizer(window=2).optimize(commands)) == commands[1:2]
+
+
+def test_construction_with_peephole() -> None:
+    peephole = PeepholeOptimizer()
+    commands = [CX(Q[0], Q[1]), CX(Q[0], Q[1]), Rz(Angle(0.5), Q[2])]
+    circuit = Circuit.from_operation_list(commands, peephole=peephole)
+    assert circuit.n_gates == 1
+    assert circuit.qubits == sorted([Q[0], Q[1], Q[2]])
+
+    circuit.extend(commands, peephole=peephole)
+    assert circuit.n_gates == 2
+    assert peephole.stats().n_removed == 4
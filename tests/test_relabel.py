@@ -0,0 +1,106 @@
+import pytest
+from pytket import Circuit, OpType
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket.circuit.logic_exp import if_not_bit, reg_eq
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+)
+from pytket_circuit_builder_api.commands.conditional import (
+    Conditional,
+    PytketCondition,
+    QasmCondition,
+)
+from pytket_circuit_builder_api.commands.relabel import relabel
+
+Q = QubitRegister("Q", 3)
+R = QubitRegister("R", 3)
+C = BitRegister("C", 2)
+D = BitRegister("D", 2)
+
+
+def test_relabel_matches_sub() -> None:
+    box = CircBox(Circuit.from_operation_list([CX(Q[0], Q[1]), Rz(Angle(0.2), Q[1])]))
+    commands = [
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.3), Q[2]),
+        CRz(Angle("a"), Q[1], Q[2]),
+        QControlled(Rz(Angle(0.4), Q[0]), [Q[1], Q[2]], [True, False]),
+        box,
+        Conditional(CX(Q[0], Q[1]), QasmCondition([C[0], C[1]], 2)),
+    ]
+    qubit_map = {Q[0]: R[0], Q[1]: R[1]}
+    bit_map = {C[0]: D[0]}
+    relabelled = relabel(commands, qubit_map, bit_map)
+    expected = [command.sub(qubit_map, bit_map) for command in commands]
+    for new, old in zip(relabelled, expected):
+        assert new.qubits() == old.qubits()
+        assert new.bits() == old.bits()
+    assert relabelled[1] is commands[1]
+    assert relabelled[4]._tket_box is box._tket_box
+    assert relabel(commands[1], qubit_map) is commands[1]
+
+
+def test_relabel_shares_repeated_commands() -> None:
+    gate = QControlled(CX(Q[0], Q[1]), [Q[2]])
+    relabelled = relabel([gate, gate], {Q[2]: R[2]})
+    assert relabelled[0] is relabelled[1]
+    assert relabelled[0].command is gate.command
+    assert relabelled[0].control_qubits == (R[2],)
+
+
+def test_pytket_condition_sub() -> None:
+    condition = PytketCondition(if_not_bit(C[0]))
+    command = Conditional(Rz(Angle(0.1), Q[0]), condition)
+    renamed = command.sub({Q[0]: R[0]}, {C[0]: D[0]})
+    assert renamed.command.qubit == R[0]
+    assert renamed.condition.expression.all_inputs() == {D[0]}
+    assert condition.expression.all_inputs() == {C[0]}
+    assert command.sub({}, {C[1]: D[1]}).condition is condition
+    assert PytketCondition(C[1]).sub({C[1]: D[1]}).expression == D[1]
+
+    circuit = Circuit()
+    circuit.add_qubit(R[0])
+    circuit.add_bit(D[0])
+    circuit.add_command(renamed)
+    assert circuit.n_gates == 1
+
+
+def test_pytket_condition_sub_registers() -> None:
+    condition = PytketCondition(reg_eq(C, 3))
+    command = Conditional(Rz(Angle(0.1), Q[0]), condition)
+    renamed = relabel(command, bit_map={C[0]: D[0], C[1]: D[1]})
+    assert renamed.condition.expression.all_inputs() == {D}
+    assert renamed.bits() == [D[0], D[1]]
+    assert condition.expression.all_inputs() == {C}
+    assert command.sub({}, {Q[0]: R[0]}).condition is condition
+
+    with pytest.raises(ValueError, match="must map in order"):
+        command.sub({}, {C[0]: D[0]})
+    with pytest.raises(ValueError, match="must map in order"):
+        command.sub({}, {C[0]: D[1], C[1]: D[0]})
+
+
+def test_relabel_buffer() -> None:
+    buffer = CommandBuffer(Q)
+    buffer.add_gates(OpType.CX, [[0, 1], [1, 2]])
+    buffer.add_gates(OpType.Rz, [0, 2], params=0.5)
+    renamed = relabel(buffer, {Q[0]: R[0], Q[2]: R[2]})
+    assert renamed.qubits() == [R[0], Q[1], R[2]]
+    assert renamed.qubit_indices is buffer.qubit_indices
+    assert [c.qubits() for c in renamed.to_commands()] == [
+        [R[0], Q[1]],
+        [Q[1], R[2]],
+        [R[0]],
+        [R[2]],
+    ]
+
+    merged = relabel(buffer, {Q[0]: Q[2]})
+    assert merged.qubits() == [Q[2], Q[1]]
+    assert [c.qubits() for c in merged.to_commands()][2:] == [[Q[2]], [Q[2]]]
+    assert len(buffer.qubits()) == 3
@@ -0,0 +1,189 @@
+import gc
+import math
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import pytest
+from pytket import Circuit, Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.buffer import CommandBuffer
+from pytket_circuit_builder_api.commands.commands import CX, CircBox, Rz
+
+# Largest growth exponent accepted for each complexity class. Timings are
+# noisy, so the bounds leave room above the ideal exponent while staying well
+# below the next class (quadratic).
+LINEAR = 1.35
+
+GEOMETRIC_SIZES = [2**k for k in range(10, 15)]
+
+# the timing tests take several seconds and depend on the load of the
+# machine, so they only run with pytest -m slow
+slow = pytest.mark.slow
+
+
+def growth_exponent(
+    prepare: Callable[[int], Any],
+    run: Callable[[Any], object],
+    sizes: Sequence[int],
+    repeat: int = 3,
+) -> float:
+    """Fit the exponent k of time ~ size**k by least squares in log-log space.
+
+    Only run is timed, on the input built by prepare, taking the best of
+    repeat runs to filter out noise.
+    """
+    times = []
+    for size in sizes:
+        argument = prepare(size)
+        best = math.inf
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            run(argument)
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum(
+        (x - x_mean) ** 2 for x in xs
+    )
+
+
+@slow
+def test_gate_count_scaling() -> None:
+    Q = QubitRegister("Q", 8)
+
+    def prepare(n_gates: int) -> list[CX | Rz]:
+        commands: list[CX | Rz] = []
+        for i in range(n_gates // 2):
+            commands.append(CX(Q[i % 8], Q[(i + 1) % 8]))
+            commands.append(Rz(Angle(0.1), Q[i % 8]))
+        return commands
+
+    assert (
+        growth_exponent(prepare, Circuit.from_operation_list, GEOMETRIC_SIZES) < LINEAR
+    )
+
+
+@slow
+def test_width_scaling() -> None:
+    # one gate per qubit: per command work must not grow with circuit width
+    def prepare(width: int) -> list[CX | Rz]:
+        Q = QubitRegister("Q", width)
+        return [Rz(Angle(0.1), Q[i]) for i in range(width)] + [
+            CX(Q[i], Q[i + 1]) for i in range(width - 1)
+        ]
+
+    assert (
+        growth_exponent(prepare, Circuit.from_operation_list, GEOMETRIC_SIZES) < LINEAR
+    )
+
+
+@slow
+def test_nesting_depth_scaling() -> None:
+    def build_nested(depth: int) -> CircBox:
+        q0, q1 = Qubit(0), Qubit(1)
+        box = CircBox(Circuit.from_operation_list([CX(q0, q1)]))
+        for _ in range(depth):
+            box = CircBox(Circuit.from_operation_list([box, Rz(Angle(0.1), q1)]))
+        return box
+
+    assert (
+        growth_exponent(lambda depth: depth, build_nested, [32, 64, 128, 256, 512])
+        < LINEAR
+    )
+
+
+@slow
+def test_circbox_sub_scaling() -> None:
+    def prepare(width: int) -> tuple[CircBox, dict[Qubit, Qubit]]:
+        Q = QubitRegister("Q", width)
+        box = CircBox(Circuit.from_operation_list([Rz(Angle(0.1), q) for q in Q]))
+        return box, {q: Qubit("R", i) for i, q in enumerate(Q)}
+
+    assert (
+        growth_exponent(
+            prepare, lambda argument: argument[0].sub(argument[1]), GEOMETRIC_SIZES
+        )
+        < LINEAR
+    )
+
+
+@slow
+def test_command_buffer_scaling() -> None:
+    Q = QubitRegister("Q", 8)
+
+    def prepare(n_gates: int) -> CommandBuffer:
+        return CommandBuffer.from_commands(
+            [CX(Q[i % 8], Q[(i + 1) % 8]) for i in range(n_gates)],
+        )
+
+    def run(buffer: CommandBuffer) -> None:
+        circuit = Circuit()
+        for qubit in Q:
+            circuit.add_qubit(qubit)
+        buffer.append_to_tket_circuit(circuit)
+
+    assert growth_exponent(prepare, run, GEOMETRIC_SIZES) < LINEAR
+
+
+@slow
+def test_growth_exponent_detects_quadratic() -> None:
+    def quadratic(n: int) -> None:
+        items: list[int] = []
+        for i in range(n):
+            items.insert(0, i)
+            items.index(0)
+
+    assert growth_exponent(lambda n: n, quadratic, [256, 512, 1024, 2048]) > LINEAR
+
+
+class UnitCounter:
+    """Counts the units tket enumerates or adds, a proxy for the work per unit."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.enumerated = 0
+        self.added = 0
+        for name in ("qubits", "bits", "n_qubits", "n_bits"):
+            getter = Circuit.__dict__[name].__get__
+            monkeypatch.setattr(Circuit, name, property(self._counting(getter)))
+        add_qubit = Circuit.add_qubit
+
+        def counting_add_qubit(circuit: Circuit, *args: Any, **kwargs: Any) -> None:
+            self.added += 1
+            add_qubit(circuit, *args, **kwargs)
+
+        monkeypatch.setattr(Circuit, "add_qubit", counting_add_qubit)
+
+    def _counting(self, getter: Callable[[Circuit], Any]) -> Callable[[Circuit], Any]:
+        def get(circuit: Circuit) -> Any:
+            value = getter(circuit)
+            self.enumerated += value if isinstance(value, int) else len(value)
+            return value
+
+        return get
+
+
+def test_units_enumerated_per_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    # work on the units of the circuit must stay proportional to the number
+    # of commands plus the width, not their product
+    for width, n_layers in [(16, 256), (256, 16), (1024, 4)]:
+        Q = QubitRegister("Q", width)
+        commands = [
+            CX(Q[i], Q[(i + 1 + layer % (width - 1)) % width])
+            for layer in range(n_layers)
+            for i in range(width)
+        ]
+        circuit = Circuit()
+        circuit.add_q_register(Q)
+        counter = UnitCounter(monkeypatch)
+        circuit.extend(commands)
+        built = Circuit.from_operation_list(commands)
+        assert counter.added == width
+        assert counter.enumerated <= 4 * (len(commands) + width)
+        assert built.n_gates == circuit.n_gates == len(commands)
+        monkeypatch.undo()
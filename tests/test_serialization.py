@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+from pytket import Circuit, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+    pytket_circbox,
+)
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.commands.serialization import (
+    dump_commands,
+    load_commands,
+)
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    @pytket_circbox
+    def block(q0: Qubit, q1: Qubit) -> CircBox:
+        yield CX(q0, q1)
+        yield Rz(Angle("a"), q1)
+
+    Q = QubitRegister("Q", 4)
+    C = BitRegister("C", 2)
+    commands = [
+        CX(Q[0], Q[1]),
+        Rz(Angle(0.25), Q[2]),
+        CRz(Angle("a + 2*b"), Q[3], Qubit("anc", [1, 2])),
+        QControlled(Rz(Angle(0.5), Q[0]), [Q[1], Q[2]], [True, False]),
+        block(Q[0], Q[3]),
+        block(Q[2], Q[1]),
+        Conditional(CRz(Angle(0.1), Q[0], Q[1]), QasmCondition([C[1], C[0]], 2)),
+    ]
+    path = tmp_path / "commands.bin"
+    dump_commands(iter(commands), path)
+
+    with load_commands(path) as loaded:
+        assert len(loaded) == len(commands)
+        assert loaded[-1].condition == QasmCondition([C[1], C[0]], 2)
+        assert loaded[2].angle.expr == Angle("a + 2*b").expr
+        assert loaded[3].control_state == (True, False)
+        assert loaded[4]._tket_box is loaded[5]._tket_box
+        assert [command.qubits() for command in loaded] == [
+            command.qubits() for command in commands
+        ]
+
+        circuits = []
+        for command_list in (loaded, commands):
+            circuit = Circuit()
+            circuit.add_q_register(Q)
+            circuit.add_qubit(Qubit("anc", [1, 2]))
+            circuit.add_c_register(C)
+            circuit.extend(command_list)
+            circuits.append(circuit)
+        assert circuits[0] == circuits[1]
+
+
+@pytest.mark.skipif(not Path("/proc/self/fd").exists(), reason="needs procfs")
+def test_invalid_file_is_closed(tmp_path: Path) -> None:
+    path = tmp_path / "invalid.cmds"
+    path.write_bytes(b"\0" * 64)
+    n_open = len(list(Path("/proc/self/fd").iterdir()))
+    # the traceback keeps the half initialized CommandFile alive
+    with pytest.raises(Exception, match="is not a command file") as error:
+        load_commands(path)
+    assert len(list(Path("/proc/self/fd").iterdir())) == n_open
+    assert error.traceback
@@ -0,0 +1,44 @@
+from collections.abc import Iterator
+
+from pytket import Circuit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.command_interface import BuildProgress
+from pytket_circuit_builder_api.commands.commands import CX, Rz
+from pytket_circuit_builder_api.commands.conditional import Conditional, QasmCondition
+from pytket_circuit_builder_api.operators.operators import CX as CXOperator
+
+
+def test_streaming_construction() -> None:
+    Q = QubitRegister("Q", 30)
+    C = BitRegister("C", 1)
+    produced = []
+
+    def generate() -> Iterator[CX | Rz | Conditional]:
+        for i in range(24):
+            produced.append(i)
+            yield CX(Q[i], Q[i + 1])
+        yield Conditional(Rz(Angle(0.5), Q[0]), QasmCondition([C[0]], 1))
+
+    reports: list[tuple[int, int]] = []
+
+    def progress(report: BuildProgress) -> None:
+        reports.append((report.n_commands, len(produced)))
+        assert report.commands_per_second >= 0
+
+    circuit = Circuit.from_operation_stream(
+        generate(), chunk_size=10, progress=progress
+    )
+    assert reports == [(10, 10), (20, 20), (25, 24)]
+    assert circuit.n_gates == 25
+    assert circuit.n_qubits == 25
+    assert circuit.bits == [C[0]]
+
+
+def test_streaming_construction_operators() -> None:
+    Q = QubitRegister("Q", 4)
+    circuit = Circuit.from_operation_stream2(
+        (CXOperator()(Q[i], Q[i + 1]) for i in range(3)),
+        chunk_size=2,
+    )
+    assert circuit.n_gates == 3
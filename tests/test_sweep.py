@@ -0,0 +1,58 @@
+import sympy
+from pytket import Circuit, OpType, Qubit
+from pytket._tket.unit_id import QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+    pytket_circbox,
+)
+from pytket_circuit_builder_api.commands.sweep import ParameterSweep
+
+
+def _rz_angles(circuit: Circuit) -> list[float]:
+    return [
+        command.op.params[0]
+        for command in circuit.get_commands()
+        if command.op.type in (OpType.Rz, OpType.CRz)
+    ]
+
+
+def test_sweep_command_list() -> None:
+    Q = QubitRegister("Q", 3)
+    sweep = ParameterSweep(
+        [
+            CRz(Angle("b"), Q[0], Q[1]),
+            CX(Q[1], Q[2]),
+            Rz(Angle("a"), Q[2]),
+            Rz(Angle(0.1), Q[0]),
+        ],
+    )
+    assert sweep.symbols == (sympy.Symbol("a"), sympy.Symbol("b"))
+
+    circuits = sweep.run([[0.5, 0.25], [1.0, 1.5]])
+    assert [sorted(_rz_angles(circuit)) for circuit in circuits] == [
+        [0.1, 0.25, 0.5],
+        [0.1, 1.0, 1.5],
+    ]
+    assert not circuits[0].free_symbols()
+    assert sweep.bind({"a": 0.5, "b": 0.25}) == circuits[0]
+
+
+def test_sweep_circbox_in_processes() -> None:
+    @pytket_circbox
+    def block(q0: Qubit, q1: Qubit) -> CircBox:
+        yield Rz(Angle("a"), q0)
+        yield QControlled(Rz(Angle("b"), q1), [q0])
+
+    sweep = ParameterSweep(block, symbols=["a", "b", "unused"])
+    batch = [[float(i), 0.5, 7.0] for i in range(6)]
+    in_process = sweep.run(batch)
+    streamed = list(sweep.stream(batch, processes=2, chunksize=2))
+    assert streamed == in_process
+    assert len(streamed) == 6
+    assert all(not circuit.free_symbols() for circuit in streamed)
+    assert streamed[3] == sweep.bind({"a": 3.0, "b": 0.5, "unused": 0.0})
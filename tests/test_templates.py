@@ -0,0 +1,133 @@
+import pytest
+from pytket import Bit, Circuit, Qubit
+from pytket._tket.unit_id import BitRegister, QubitRegister
+from pytket_circuit_builder_api.angle import Angle
+from pytket_circuit_builder_api.commands.commands import (
+    CX,
+    CircBox,
+    CRz,
+    QControlled,
+    Rz,
+    pytket_circbox,
+    pytket_operator,
+)
+from pytket_circuit_builder_api.commands.conditional import (
+    Conditional,
+    PytketCondition,
+    QasmCondition,
+)
+
+
+def test_compiled_call_matches_keyword_call() -> None:
+    @pytket_operator
+    def crz_if(t: Qubit, f1: Bit, c: Qubit, f2: Bit) -> Conditional:
+        return Conditional(CRz(Angle("a"), t, c), QasmCondition([f2, f1], 1))
+
+    @pytket_operator
+    def cccx(t: Qubit, c1: Qubit, c2: Qubit, c3: Qubit) -> QControlled:
+        return QControlled(CX(t, c1), [c2, c3], [True, False])
+
+    Q = QubitRegister("Q", 4)
+    C = BitRegister("C", 2)
+    fast = crz_if(Q[0], C[0], Q[1], C[1])
+    slow = crz_if(Q[0], C[0], c=Q[1], f2=C[1])
+    assert fast.qubits() == slow.qubits() == [Q[0], Q[1]]
+    assert fast.bits() == slow.bits() == [C[1], C[0]]
+
+    controlled = cccx(Q[3], Q[2], Q[1], Q[0])
+    assert controlled.qubits() == [Q[1], Q[0], Q[3], Q[2]]
+    assert controlled.control_state == (True, False)
+
+    circuit = Circuit()
+    circuit.add_q_register(Q)
+    circuit.add_c_register(C)
+    circuit.extend([fast, slow, controlled])
+    assert circuit.n_gates == 3
+
+
+def test_compiled_call_with_pytket_condition() -> None:
+    @pytket_operator
+    def rz_if(q: Qubit, f1: Bit, f2: Bit) -> Conditional:
+        return Conditional(Rz(Angle(0.5), q), PytketCondition(f1 & f2))
+
+    Q = QubitRegister("Q", 1)
+    C = BitRegister("C", 2)
+    # pytket conditions have no compiled plan and are substituted with sub
+    command = rz_if(Q[0], C[1], C[0])
+    assert command == rz_if(q=Q[0], f1=C[1], f2=C[0])
+    assert command.bits() == [C[1], C[0]]
+
+
+def test_compiled_call_checks_operand_types() -> None:
+    @pytket_operator
+    def cx(t: Qubit, c: Qubit) -> CX:
+        return CX(t, c)
+
+    @pytket_circbox
+    def block(q0: Qubit, b0: Bit) -> CircBox:
+        yield Rz(Angle(0.5), q0)
+
+    Q = QubitRegister("Q", 2)
+    with pytest.raises(Exception, match="Number of provided qubits must match"):
+        cx(Q[0], Bit("c", 0))
+    with pytest.raises(Exception, match="Number of provided qubits must match"):
+        block(Q[0], Q[1])
+
+
+def test_compiled_circbox_call() -> None:
+    @pytket_circbox
+    def block(q0: Qubit, q1: Qubit) -> CircBox:
+        yield CX(q0, q1)
+        yield Rz(Angle(0.5), q1)
+
+    Q = QubitRegister("Q", 2)
+    box = block(Q[1], Q[0])
+    assert box.qubits() == [Q[1], Q[0]]
+    assert box._tket_box is block(q0=Q[0], q1=Q[1])._tket_box
+
+
+def test_template_cache() -> None:
+    @pytket_operator(cache_size=2)
+    def ccrz(t: Qubit, c1: Qubit, c2: Qubit) -> QControlled:
+        return QControlled(Rz(Angle("b"), t), [c1, c2])
+
+    @pytket_circbox(cache_size=8)
+    def block(q0: Qubit, q1: Qubit) -> CircBox:
+        yield CX(q0, q1)
+
+    Q = QubitRegister("Q", 3)
+    first = ccrz(Q[0], Q[1], Q[2])
+    assert ccrz(Q[0], Q[1], Q[2]) is first
+    ccrz(Q[1], Q[2], Q[0])
+    ccrz(Q[2], Q[0], Q[1])
+    assert ccrz(Q[0], Q[1], Q[2]) is not first
+
+    stats = ccrz.command_template.cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 4, 2)
+    assert stats.maxsize == 2
+
+    assert block(Q[0], Q[1]) is block(Q[0], Q[1])
+    assert block(q0=Q[0], q1=Q[1]) is block(q0=Q[0], q1=Q[1])
+    assert block(Q[0], Q[1]) is block(q0=Q[0], q1=Q[1])
+    assert block.command_template.cache_stats().size == 1
+
+    # keyword calls and calls with bits between qubits share entries
+    @pytket_operator(cache_size=4)
+    def rz_if(t: Qubit, f: Bit, c: Qubit) -> Conditional:
+        return Conditional(CRz(Angle(0.1), t, c), QasmCondition([f], 1))
+
+    C = BitRegister("C", 1)
+    assert rz_if(Q[0], C[0], Q[1]) is rz_if(t=Q[0], f=C[0], c=Q[1])
+    assert rz_if.command_template.cache_stats().size == 1
+
+    # cached instances are shared, so their operands cannot be changed
+    box = block(Q[0], Q[1])
+    box.qubits().append(Q[2])
+    assert block(Q[0], Q[1]).qubits() == [Q[0], Q[1]]
+
+    @pytket_circbox
+    def uncached(q0: Qubit) -> CircBox:
+        yield Rz(Angle(0.1), q0)
+
+    assert uncached.command_template.cache_stats() is None
+    assert uncached(Q[0]) is not uncached(Q[0])